@@ -1,28 +1,1021 @@
+import array
+import functools
+import math
+import mmap
+import os
+import sys
+import wave
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from dataclasses import dataclass, fields
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the "python" backend needs nothing.
+    np = None
+
+# Loudness floor reported for silent or empty signals.
+DB_FLOOR = -80.0
+
+BACKENDS = ("python", "numpy")
+
+# The "numpy" backend agrees with the "python" backend on the same stored
+# samples to within pytest.approx(rel=NUMPY_RTOL, abs=NUMPY_ATOL). Only the
+# summation order differs; both accumulate in float64. Storing float64 input
+# as float32 additionally rounds every sample by up to ~6e-8 relative.
+NUMPY_RTOL = 1e-9
+NUMPY_ATOL = 1e-9
+
+# Samples per block in the NumPy kernels. Blocks are widened to float64 one at
+# a time, so float32 storage never needs a full-length float64 copy.
+_NP_BLOCK = 1 << 16
+
+
+@dataclass(frozen=True)
+class AudioFeatures:
+    """Every AudioProcessor metric, as returned by ``AudioProcessor.analyze``.
+
+    Each field holds exactly what the method of the same name returns.
+    """
+
+    normalize: float
+    compute_rms: float
+    compute_decibels: float
+    zero_crossing_rate: float
+    spectral_centroid_bin: float
+    silence_ratio: float
+
+
+FEATURE_NAMES = tuple(f.name for f in fields(AudioFeatures))
+
+
+@dataclass(frozen=True)
+class FrameFeatures:
+    """Per-frame metrics from ``AudioProcessor.frames``.
+
+    There is one column per AudioFeatures field; row ``i`` describes the
+    frame starting at sample ``i * hop_length``. Columns are float64
+    ndarrays on the "numpy" backend and ``array.array("d")`` otherwise.
+    """
+
+    frame_length: int
+    hop_length: int
+    normalize: object
+    compute_rms: object
+    compute_decibels: object
+    zero_crossing_rate: object
+    spectral_centroid_bin: object
+    silence_ratio: object
+
+    def __len__(self) -> int:
+        return len(self.normalize)
+
+    def matrix(self):
+        """
+        Returns:
+            An (n_frames, 6) float64 ndarray with columns in FEATURE_NAMES
+            order. Requires NumPy.
+        """
+        if np is None:
+            raise ImportError("FrameFeatures.matrix() requires NumPy to be installed")
+        columns = [np.asarray(getattr(self, name), dtype=np.float64) for name in FEATURE_NAMES]
+        return np.column_stack(columns) if len(self) else np.zeros((0, len(FEATURE_NAMES)))
+
+
+# spectral_centroid_bin measures the signal's spectrum at the n_bins
+# frequencies k / (2 * n_bins) cycles per sample, evenly spaced from DC up to
+# (excluding) Nyquist. Sampling the spectrum at multiples of 1 / period equals
+# the period-point DFT of the signal folded modulo period:
+#
+#     X(k / period) = sum_r (sum_q x[r + q * period]) * exp(-2j * pi * k * r / period)
+#
+# so every backend folds the samples into 2 * n_bins running sums in O(N) and
+# then runs one small FFT, whatever the signal length.
+
+
+@functools.lru_cache(maxsize=32)
+def _spectrum_plan(n_bins: int) -> tuple:
+    """Twiddle tables (and the bit-reversal order, when the period is a power
+    of two) for the pure-Python period-point DFT. Cached per ``n_bins``:
+    folding makes the plan independent of the signal length."""
+    period = 2 * n_bins
+    cos_t = [math.cos(math.pi * j / n_bins) for j in range(period)]
+    sin_t = [math.sin(math.pi * j / n_bins) for j in range(period)]
+    bitrev = None
+    if period & (period - 1) == 0:
+        bits = period.bit_length() - 1
+        bitrev = [int(format(i, f"0{bits}b")[::-1], 2) if bits else 0 for i in range(period)]
+    return cos_t, sin_t, bitrev
+
+
+def _fft_radix2(folded: list[float], cos_t, sin_t, bitrev) -> tuple[list[float], list[float]]:
+    """Iterative radix-2 FFT of a real sequence whose length is a power of two."""
+    n = len(folded)
+    re = [folded[i] for i in bitrev]
+    im = [0.0] * n
+    size = 2
+    while size <= n:
+        half = size // 2
+        step = n // size
+        for start in range(0, n, size):
+            for j in range(half):
+                wr, wi = cos_t[j * step], -sin_t[j * step]
+                a, b = start + j, start + j + half
+                tr = wr * re[b] - wi * im[b]
+                ti = wr * im[b] + wi * re[b]
+                re[b], im[b] = re[a] - tr, im[a] - ti
+                re[a] += tr
+                im[a] += ti
+        size *= 2
+    return re, im
+
+
+def _folded_magnitudes(folded: list[float], n_bins: int) -> list[float]:
+    """Spectrum magnitudes at the ``n_bins`` centroid frequencies, from the
+    signal folded modulo ``2 * n_bins``. Uses NumPy's rfft when installed,
+    else a radix-2 FFT, else (period not a power of two) a direct DFT."""
+    if np is not None:
+        return np.abs(np.fft.rfft(folded)[:n_bins]).tolist()
+    cos_t, sin_t, bitrev = _spectrum_plan(n_bins)
+    if bitrev is not None:
+        re, im = _fft_radix2(folded, cos_t, sin_t, bitrev)
+        return [math.hypot(re[k], im[k]) for k in range(n_bins)]
+    period = 2 * n_bins
+    magnitudes = []
+    for k in range(n_bins):
+        re = im = 0.0
+        for r, v in enumerate(folded):
+            j = k * r % period
+            re += v * cos_t[j]
+            im -= v * sin_t[j]
+        magnitudes.append(math.hypot(re, im))
+    return magnitudes
+
+
+def _fold(samples, n_bins: int) -> list[float]:
+    period = 2 * n_bins
+    folded = [0.0] * period
+    pos = 0
+    for s in samples:
+        folded[pos] += s
+        pos += 1
+        if pos == period:
+            pos = 0
+    return folded
+
+
+def _centroid_from_magnitudes(magnitudes: list[float]) -> float:
+    """Magnitude-weighted mean bin index, scaled to [0.0, 1.0]."""
+    n_bins = len(magnitudes)
+    total = sum(magnitudes)
+    if n_bins < 2 or total <= 0.0:
+        return 0.0
+    weighted = sum(k * m for k, m in enumerate(magnitudes))
+    return min(max(weighted / total / (n_bins - 1), 0.0), 1.0)
+
+
+def _np_scan(
+    x,
+    *,
+    peak: bool = False,
+    squares: bool = False,
+    crossings: bool = False,
+    threshold: float | None = None,
+    n_bins: int = 0,
+) -> dict:
+    """Blocked NumPy reduction of the raw per-signal totals that the metrics
+    are finished from. Only the requested totals are computed, in one pass."""
+    max_abs = 0.0
+    sum_squares = 0.0
+    n_crossings = 0
+    silent = 0
+    prev_negative = None
+    if n_bins > 0:
+        period = 2 * n_bins
+        folded = np.zeros(period)
+
+    for start in range(0, len(x), _NP_BLOCK):
+        block = x[start:start + _NP_BLOCK].astype(np.float64, copy=False)
+        if peak or threshold is not None:
+            magnitude = np.abs(block)
+            if peak:
+                max_abs = max(max_abs, float(magnitude.max()))
+            if threshold is not None:
+                silent += int(np.count_nonzero(magnitude < threshold))
+        if squares:
+            sum_squares += float(np.dot(block, block))
+        if crossings:
+            negative = block < 0
+            n_crossings += int(np.count_nonzero(negative[1:] != negative[:-1]))
+            if prev_negative is not None and negative[0] != prev_negative:
+                n_crossings += 1
+            prev_negative = negative[-1]
+        if n_bins > 0:
+            folded += _np_fold(block, start % period, period)
+
+    totals = {
+        "n": len(x),
+        "max_abs": max_abs,
+        "sum_squares": sum_squares,
+        "crossings": n_crossings,
+        "silent": silent,
+    }
+    if n_bins > 0:
+        totals["magnitudes"] = np.abs(np.fft.rfft(folded)[:n_bins]).tolist()
+    return totals
+
+
+def _np_fold(block, offset: int, period: int):
+    """Sums ``block``, whose first sample sits at position ``offset`` within
+    its period, into a single period."""
+    end = offset + len(block)
+    padded = np.zeros(-(-end // period) * period)
+    padded[offset:end] = block
+    return padded.reshape(-1, period).sum(axis=0)
+
+
+def _as_array(samples, dtype=None):
+    """Views ``samples`` as a 1-D float ndarray, copying only when the input
+    is a Python sequence or its dtype has to change."""
+    arr = np.asarray(samples)
+    if arr.ndim != 1:
+        raise ValueError(f"samples must be 1-D, got shape {arr.shape}")
+    if dtype is None:
+        if arr.dtype not in (np.float32, np.float64):
+            arr = arr.astype(np.float64)
+    else:
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float32, np.float64):
+            raise ValueError(f"dtype must be float32 or float64, got {dtype}")
+        arr = arr.astype(dtype, copy=False)
+    return arr
+
+
+def _frame_layout(n: int, frame_length: int, hop_length: int) -> tuple[int, int, int, int]:
+    """Frames start every ``hop_length`` samples and never run past the end.
+    They are built from segments of ``gcd(frame_length, hop_length)``
+    samples, so overlapping frames share whole segments.
+
+    Returns:
+        (n_frames, segment, segments_per_frame, segments_per_hop)
+    """
+    if frame_length <= 0 or hop_length <= 0:
+        raise ValueError("frame_length and hop_length must be positive")
+    n_frames = 0 if n < frame_length else 1 + (n - frame_length) // hop_length
+    segment = math.gcd(frame_length, hop_length)
+    return n_frames, segment, frame_length // segment, hop_length // segment
+
+
+def _frame_totals_python(span, n_frames, segment, per_frame, stride, threshold):
+    """Per-frame (max_abs, sum_squares, crossings, silent) for the frames of
+    ``span``, computed from per-segment totals: counts with prefix sums,
+    energy by adding the frame's segments, the peak with a sliding maximum."""
+    seg_max = []
+    seg_squares = []
+    silent_prefix = [0]
+    cross_prefix = [0]
+    # Crossing between a segment's first sample and the previous sample;
+    # a frame starting at that segment must not count it.
+    left_cross = []
+    prev_negative = None
+    n_segments = (n_frames - 1) * stride + per_frame
+    for seg in range(n_segments):
+        max_abs = 0.0
+        sum_squares = 0.0
+        silent = 0
+        crossings = 0
+        first = True
+        for s in span[seg * segment:(seg + 1) * segment]:
+            a = abs(s)
+            if a > max_abs:
+                max_abs = a
+            sum_squares += s * s
+            if a < threshold:
+                silent += 1
+            negative = s < 0
+            crossed = prev_negative is not None and negative != prev_negative
+            if first:
+                left_cross.append(1 if crossed else 0)
+                first = False
+            if crossed:
+                crossings += 1
+            prev_negative = negative
+        seg_max.append(max_abs)
+        seg_squares.append(sum_squares)
+        silent_prefix.append(silent_prefix[-1] + silent)
+        cross_prefix.append(cross_prefix[-1] + crossings)
+
+    totals = []
+    window = deque()
+    next_seg = 0
+    for f in range(n_frames):
+        lo, hi = f * stride, f * stride + per_frame
+        while next_seg < hi:
+            while window and seg_max[window[-1]] <= seg_max[next_seg]:
+                window.pop()
+            window.append(next_seg)
+            next_seg += 1
+        while window[0] < lo:
+            window.popleft()
+        totals.append((
+            seg_max[window[0]],
+            # Not a prefix-sum difference: over a long span that cancels
+            # away the precision of a quiet frame after loud ones.
+            sum(seg_squares[lo:hi]),
+            cross_prefix[hi] - cross_prefix[lo] - left_cross[lo],
+            silent_prefix[hi] - silent_prefix[lo],
+        ))
+    return totals
+
+
+def _frame_totals_numpy(span, n_frames, segment, per_frame, stride, threshold):
+    """NumPy version of ``_frame_totals_python``, returning four columns."""
+    n_segments = (n_frames - 1) * stride + per_frame
+    span = span[:n_segments * segment]
+    segs = span.reshape(n_segments, segment)
+    magnitude = np.abs(segs)
+    seg_max = magnitude.max(axis=1)
+    negative = span < 0
+    crossed = np.zeros(len(span), dtype=np.int64)
+    crossed[1:] = negative[1:] != negative[:-1]
+    crossed = crossed.reshape(n_segments, segment)
+
+    def window_sums(per_segment):
+        prefix = np.concatenate(([0], np.cumsum(per_segment)))
+        lo = np.arange(n_frames) * stride
+        return prefix[lo + per_frame] - prefix[lo], lo
+
+    def frame_windows(per_segment):
+        return np.lib.stride_tricks.sliding_window_view(per_segment, per_frame)[::stride]
+
+    crossings, lo = window_sums(crossed.sum(axis=1))
+    silent, _ = window_sums(np.count_nonzero(magnitude < threshold, axis=1))
+    # Counts are exact as prefix-sum differences; energies are not.
+    sum_squares = frame_windows(np.einsum("ij,ij->i", segs, segs)).sum(axis=1)
+    max_abs = frame_windows(seg_max).max(axis=1)
+    return max_abs, sum_squares, crossings - crossed[lo, 0], silent
+
+
+def _frame_centroids_numpy(frames, n_bins):
+    """Spectral centroid of each row of ``frames`` (n_frames, frame_length)."""
+    n_frames, frame_length = frames.shape
+    period = 2 * n_bins
+    # Fold one period at a time: frames is usually a strided view of
+    # overlapping windows, which a padded copy would expand in full.
+    folded = np.zeros((n_frames, period))
+    for start in range(0, frame_length, period):
+        part = frames[:, start:start + period]
+        folded[:, :part.shape[1]] += part
+    magnitudes = np.abs(np.fft.rfft(folded, axis=1)[:, :n_bins])
+    if n_bins < 2:
+        return np.zeros(n_frames)
+    total = magnitudes.sum(axis=1)
+    weighted = magnitudes @ np.arange(n_bins, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        centroid = np.where(total > 0.0, weighted / total / (n_bins - 1), 0.0)
+    return np.clip(centroid, 0.0, 1.0)
+
+
+def _map_file(f):
+    """Read-only mmap of an open file; None if it is empty, which cannot be
+    mapped. The mapping stays valid after the file is closed."""
+    if f.seek(0, 2) == 0:
+        return None
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _wav_data_chunk(mapped) -> tuple[int, int]:
+    """Byte offset and length of a RIFF/WAVE file's "data" chunk."""
+    pos = 12
+    end = len(mapped)
+    while pos + 8 <= end:
+        chunk_id = mapped[pos:pos + 4]
+        size = int.from_bytes(mapped[pos + 4:pos + 8], "little")
+        if chunk_id == b"data":
+            return pos + 8, min(size, end - pos - 8)
+        pos += 8 + size + (size & 1)
+    raise ValueError("WAV file has no data chunk")
+
+
+def _share_clip(clip) -> tuple[shared_memory.SharedMemory, int]:
+    """Copies a clip into a new float64 shared-memory block.
+
+    Returns:
+        (block, number of samples)
+    """
+    if isinstance(clip, PcmSamples):
+        clip = clip[:]
+    if np is not None:
+        values = np.asarray(clip, dtype=np.float64)
+        if values.ndim != 1:
+            raise ValueError(f"samples must be 1-D, got shape {values.shape}")
+    else:
+        values = array.array("d", clip)
+    n = len(values)
+    # Zero-size blocks are not allowed, so empty clips get one unused byte.
+    block = shared_memory.SharedMemory(create=True, size=max(8 * n, 1))
+    block.buf[:8 * n].cast("d")[:] = memoryview(values).cast("B").cast("d")
+    return block, n
+
+
+def _analyze_shared(name: str, n: int, n_bins: int, threshold: float, backend: str) -> "AudioFeatures":
+    """Process-pool worker: analyzes a clip left in shared memory by
+    ``_share_clip`` without copying it into the worker."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        view = block.buf[:8 * n].cast("d")
+        features = AudioProcessor(view, backend=backend).analyze(n_bins=n_bins, threshold=threshold)
+        # Views into the block must be gone before it can be closed.
+        del view
+        return features
+    finally:
+        block.close()
+
+
+def _collect_shared(job) -> "AudioFeatures":
+    """Waits for an ``_analyze_shared`` future and frees its clip's block."""
+    future, block = job
+    try:
+        return future.result()
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _peak(max_abs: float) -> float:
+    return min(max_abs, 1.0)
+
+
+def _rms(sum_squares: float, n: int) -> float:
+    if n == 0:
+        return 0.0
+    return min(math.sqrt(sum_squares / n), 1.0)
+
+
+def _decibels(rms: float) -> float:
+    if rms <= 0.0:
+        return DB_FLOOR
+    return min(max(20.0 * math.log10(rms), DB_FLOOR), 0.0)
+
+
+def _crossing_rate(crossings: int, n: int) -> float:
+    if n < 2:
+        return 0.0
+    return crossings / (n - 1)
+
+
+def _silence_ratio(silent: int, n: int) -> float:
+    if n == 0:
+        return 1.0
+    return silent / n
+
+
+# PCM sample formats: memoryview typecode, little-endian NumPy dtype, the
+# offset of the zero level, and the scale mapping full range onto [-1.0, 1.0].
+_PCM_FORMATS = {
+    "uint8": ("B", "<u1", 128, 1.0 / 128),
+    "int16": ("h", "<i2", 0, 1.0 / 32768),
+    "int32": ("i", "<i4", 0, 1.0 / 2147483648),
+    "float32": ("f", "<f4", 0, 1.0),
+    "float64": ("d", "<f8", 0, 1.0),
+}
+# Sample width in bytes of the integer PCM formats the stdlib ``wave`` reads.
+_WAV_WIDTHS = {1: "uint8", 2: "int16", 4: "int32"}
+
+
+class PcmSamples:
+    """Read-only sequence of normalized float samples over interleaved PCM.
+
+    Nothing is decoded up front: indexing a slice converts just that range,
+    optionally picking one channel or averaging all of them. The NumPy
+    kernels read the signal one block at a time, so a memory-mapped file is
+    analyzed without ever materializing it as floats.
+    """
+
+    def __init__(self, buffer, dtype: str = "int16", channels: int = 1,
+                 channel: int | None = None, sample_rate: int | None = None):
+        """
+        Args:
+            buffer: Bytes-like interleaved little-endian PCM, e.g. an mmap
+            dtype: One of "uint8", "int16", "int32", "float32", "float64"
+            channels: Interleaved channel count
+            channel: Channel to read; None averages all channels
+            sample_rate: Frames per second, kept for reference only
+        """
+        if dtype not in _PCM_FORMATS:
+            raise ValueError(f"dtype must be one of {tuple(_PCM_FORMATS)}, got {dtype!r}")
+        if channels <= 0:
+            raise ValueError("channels must be positive")
+        if channel is not None and not 0 <= channel < channels:
+            raise ValueError(f"channel must be in [0, {channels}), got {channel}")
+        typecode, np_dtype, self._offset, self._scale = _PCM_FORMATS[dtype]
+        self.dtype = dtype
+        self.channels = channels
+        self.channel = channel
+        self.sample_rate = sample_rate
+
+        raw = memoryview(buffer).cast("B")
+        width = np.dtype(np_dtype).itemsize if np is not None else array.array(typecode).itemsize
+        self._len = len(raw) // (width * channels)
+        raw = raw[:self._len * width * channels]
+        if np is not None:
+            self._frames = np.frombuffer(raw, dtype=np_dtype).reshape(self._len, channels)
+        else:
+            if sys.byteorder != "little":
+                raise NotImplementedError("reading PCM without NumPy needs a little-endian host")
+            self._frames = raw.cast(typecode)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index):
+        """Returns a float for an integer index; for a slice, a float64
+        ndarray (or a list of floats without NumPy)."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if np is not None:
+                frames = self._frames[start:stop:step]
+                if self.channel is not None:
+                    block = frames[:, self.channel].astype(np.float64)
+                else:
+                    block = frames.mean(axis=1, dtype=np.float64)
+                if self._offset:
+                    block -= self._offset
+                if self._scale != 1.0:
+                    block *= self._scale
+                return block
+            return [self._sample(i) for i in range(start, stop, step)]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("PcmSamples index out of range")
+        return float(self[index:index + 1][0])
+
+    def _sample(self, i: int) -> float:
+        channels = self.channels
+        if self.channel is not None:
+            value = self._frames[i * channels + self.channel]
+        else:
+            value = sum(self._frames[i * channels:(i + 1) * channels]) / channels
+        return (value - self._offset) * self._scale
+
+    def __iter__(self):
+        for start in range(0, self._len, _NP_BLOCK):
+            block = self[start:start + _NP_BLOCK]
+            yield from (block.tolist() if np is not None else block)
+
+
 class AudioProcessor:
     """Processes audio signals where most outputs have constrained ranges
     that type hints alone cannot express."""
 
-    def __init__(self, samples: list[float]):
+    def __init__(self, samples: list[float], backend: str = "auto", dtype=None):
         """
         Args:
-            samples: Raw audio samples, each in range [-1.0, 1.0]
+            samples: Raw audio samples, each in range [-1.0, 1.0]. A list,
+                ``array.array``, ``memoryview``, ndarray or PcmSamples.
+            backend: "python", "numpy", or "auto" to pick "numpy" for
+                buffer and ndarray input when NumPy is installed
+            dtype: float32 or float64 storage for the "numpy" backend.
+                Defaults to the input's float dtype, else float64. PcmSamples
+                are always read as float64 blocks and ignore it.
         """
+        if backend == "auto":
+            buffered = isinstance(samples, (array.array, memoryview, PcmSamples)) or (
+                np is not None and isinstance(samples, np.ndarray)
+            )
+            backend = "numpy" if buffered and np is not None else "python"
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS} or 'auto', got {backend!r}")
+        if backend == "numpy":
+            if np is None:
+                raise ImportError("backend='numpy' requires NumPy to be installed")
+            if not isinstance(samples, PcmSamples):
+                samples = _as_array(samples, dtype)
+        elif np is not None and isinstance(samples, np.ndarray):
+            # Iterating an ndarray yields NumPy scalars, whose float32
+            # arithmetic would not match the float64 pure-Python path.
+            samples = samples.tolist()
         self.samples = samples
+        self.backend = backend
+
+    def with_backend(self, backend: str, dtype=None) -> "AudioProcessor":
+        """
+        Returns:
+            A processor over the same samples using ``backend``, for
+            comparing results between backends.
+        """
+        return AudioProcessor(self.samples, backend=backend, dtype=dtype)
+
+    @classmethod
+    def from_wav(cls, path, channel: int | None = None, backend: str = "auto") -> "AudioProcessor":
+        """Memory-maps an 8/16/32-bit PCM WAV file.
+
+        Args:
+            path: WAV file to read
+            channel: Channel to analyze; None averages all channels
+            backend: As for ``AudioProcessor``
+
+        Returns:
+            A processor whose ``samples`` are a PcmSamples view of the file's
+            data chunk.
+        """
+        with wave.open(str(path), "rb") as wav:
+            channels = wav.getnchannels()
+            width = wav.getsampwidth()
+            sample_rate = wav.getframerate()
+        if width not in _WAV_WIDTHS:
+            raise ValueError(f"unsupported WAV sample width: {8 * width} bits")
+        with open(path, "rb") as f:
+            mapped = _map_file(f)
+        start, size = _wav_data_chunk(mapped)
+        view = memoryview(mapped)[start:start + size]
+        samples = PcmSamples(view, _WAV_WIDTHS[width], channels, channel, sample_rate)
+        return cls(samples, backend=backend)
+
+    @classmethod
+    def from_raw(cls, path, dtype: str = "int16", channels: int = 1,
+                 channel: int | None = None, backend: str = "auto") -> "AudioProcessor":
+        """Memory-maps a headerless file of interleaved little-endian PCM.
+
+        Args:
+            path: File to read
+            dtype: Sample format, as for PcmSamples
+            channels: Interleaved channel count
+            channel: Channel to analyze; None averages all channels
+            backend: As for ``AudioProcessor``
+        """
+        with open(path, "rb") as f:
+            mapped = _map_file(f)
+        samples = PcmSamples(mapped if mapped is not None else b"", dtype, channels, channel)
+        return cls(samples, backend=backend)
 
     def normalize(self) -> float:
-        pass
+        """
+        Returns:
+            Peak absolute amplitude, clamped to [0.0, 1.0]. 0.0 if empty.
+        """
+        if self.backend == "numpy":
+            return _peak(_np_scan(self.samples, peak=True)["max_abs"])
+        max_abs = 0.0
+        for s in self.samples:
+            a = abs(s)
+            if a > max_abs:
+                max_abs = a
+        return _peak(max_abs)
 
     def compute_rms(self) -> float:
-        pass
+        """
+        Returns:
+            Root-mean-square amplitude, clamped to [0.0, 1.0]. 0.0 if empty.
+        """
+        if self.backend == "numpy":
+            totals = _np_scan(self.samples, squares=True)
+            return _rms(totals["sum_squares"], totals["n"])
+        sum_squares = 0.0
+        for s in self.samples:
+            sum_squares += s * s
+        return _rms(sum_squares, len(self.samples))
 
     def compute_decibels(self) -> float:
-        pass
+        """
+        Returns:
+            RMS level in dBFS, in range [-80.0, 0.0]. Silence maps to -80.0.
+        """
+        return _decibels(self.compute_rms())
 
     def zero_crossing_rate(self) -> float:
-        pass
+        """
+        Returns:
+            Fraction of consecutive sample pairs whose sign differs, in
+            range [0.0, 1.0]. Zero counts as positive. 0.0 for fewer than
+            two samples.
+        """
+        if self.backend == "numpy":
+            totals = _np_scan(self.samples, crossings=True)
+            return _crossing_rate(totals["crossings"], totals["n"])
+        crossings = 0
+        prev_negative = None
+        for s in self.samples:
+            negative = s < 0
+            if prev_negative is not None and negative != prev_negative:
+                crossings += 1
+            prev_negative = negative
+        return _crossing_rate(crossings, len(self.samples))
 
     def spectral_centroid_bin(self, n_bins: int = 256) -> float:
-        pass
+        """
+        Args:
+            n_bins: Number of frequency bins spread evenly from DC up to
+                Nyquist
+
+        Returns:
+            Magnitude-weighted centroid bin divided by ``n_bins - 1``, in
+            range [0.0, 1.0]. 0.0 if empty, silent or ``n_bins < 2``.
+        """
+        if n_bins <= 0:
+            return 0.0
+        if self.backend == "numpy":
+            return _centroid_from_magnitudes(_np_scan(self.samples, n_bins=n_bins)["magnitudes"])
+        return _centroid_from_magnitudes(_folded_magnitudes(_fold(self.samples, n_bins), n_bins))
 
     def silence_ratio(self, threshold: float = 0.01) -> float:
-        pass
\ No newline at end of file
+        """
+        Args:
+            threshold: Samples with absolute amplitude below this are silent
+
+        Returns:
+            Fraction of silent samples, in range [0.0, 1.0]. 1.0 if empty.
+        """
+        if self.backend == "numpy":
+            totals = _np_scan(self.samples, threshold=threshold)
+            return _silence_ratio(totals["silent"], totals["n"])
+        silent = 0
+        for s in self.samples:
+            if abs(s) < threshold:
+                silent += 1
+        return _silence_ratio(silent, len(self.samples))
+
+    def analyze(self, n_bins: int = 256, threshold: float = 0.01) -> AudioFeatures:
+        """Computes every metric in a single pass over ``samples``.
+
+        Args:
+            n_bins: Passed to ``spectral_centroid_bin``
+            threshold: Passed to ``silence_ratio``
+
+        Returns:
+            AudioFeatures whose fields equal the individual methods' results.
+        """
+        if self.backend == "numpy":
+            return self._analyze_numpy(n_bins, threshold)
+        stream = StreamingAudioProcessor(threshold=threshold, n_bins=n_bins)
+        stream.push(self.samples)
+        return stream.analyze()
+
+    def frames(
+        self,
+        frame_length: int = 2048,
+        hop_length: int = 512,
+        n_bins: int = 256,
+        threshold: float = 0.01,
+    ) -> FrameFeatures:
+        """Computes every metric for each ``frame_length`` window, advancing
+        ``hop_length`` samples at a time. Trailing samples that do not fill
+        a whole frame are ignored.
+
+        Frames are processed in batches. Within a batch, overlapping frames
+        share per-segment totals: counts come from prefix sums, energy from
+        adding the frame's segment energies, the peak from a sliding
+        maximum. Peak, crossing and silence columns equal
+        ``AudioProcessor(frame)``; RMS, decibels and centroid agree to within
+        NUMPY_RTOL/NUMPY_ATOL, however loud the rest of the signal.
+
+        Args:
+            frame_length: Samples per frame
+            hop_length: Samples between the starts of consecutive frames
+            n_bins: Passed to ``spectral_centroid_bin``
+            threshold: Passed to ``silence_ratio``
+
+        Returns:
+            FrameFeatures with one row per frame.
+        """
+        n_frames, segment, per_frame, stride = _frame_layout(
+            len(self.samples), frame_length, hop_length
+        )
+        # Batches are sized so a batch's span and its folded frames (the
+        # windows are views) hold about 4 * _NP_BLOCK values each, whatever
+        # the frame length or hop.
+        batch = max(1, 4 * _NP_BLOCK // max(hop_length, 2 * n_bins))
+        if self.backend == "numpy":
+            columns = [np.empty(n_frames) for _ in FEATURE_NAMES]
+        else:
+            columns = [array.array("d") for _ in FEATURE_NAMES]
+        peak, rms, decibels, zcr, centroid, silence = columns
+
+        for f0 in range(0, n_frames, batch):
+            count = min(batch, n_frames - f0)
+            span = self.samples[f0 * hop_length:(f0 + count - 1) * hop_length + frame_length]
+            if self.backend == "numpy":
+                span = span.astype(np.float64, copy=False)
+                max_abs, sum_squares, crossings, silent = _frame_totals_numpy(
+                    span, count, segment, per_frame, stride, threshold
+                )
+                rows = slice(f0, f0 + count)
+                peak[rows] = np.minimum(max_abs, 1.0)
+                rms[rows] = np.minimum(np.sqrt(sum_squares / frame_length), 1.0)
+                with np.errstate(divide="ignore"):
+                    decibels[rows] = np.clip(20.0 * np.log10(rms[rows]), DB_FLOOR, 0.0)
+                zcr[rows] = crossings / (frame_length - 1) if frame_length > 1 else 0.0
+                silence[rows] = silent / frame_length
+                if n_bins > 0:
+                    windows = np.lib.stride_tricks.sliding_window_view(span, frame_length)
+                    centroid[rows] = _frame_centroids_numpy(windows[::hop_length], n_bins)
+                else:
+                    centroid[rows] = 0.0
+                continue
+            for f, (max_abs, sum_squares, crossings, silent) in enumerate(
+                _frame_totals_python(span, count, segment, per_frame, stride, threshold)
+            ):
+                peak.append(_peak(max_abs))
+                rms.append(_rms(sum_squares, frame_length))
+                decibels.append(_decibels(rms[-1]))
+                zcr.append(_crossing_rate(crossings, frame_length))
+                silence.append(_silence_ratio(silent, frame_length))
+                if n_bins > 0:
+                    frame = span[f * hop_length:f * hop_length + frame_length]
+                    magnitudes = _folded_magnitudes(_fold(frame, n_bins), n_bins)
+                    centroid.append(_centroid_from_magnitudes(magnitudes))
+                else:
+                    centroid.append(0.0)
+
+        return FrameFeatures(frame_length, hop_length, *columns)
+
+    @classmethod
+    def analyze_many(
+        cls,
+        clips,
+        workers: int | None = None,
+        n_bins: int = 256,
+        threshold: float = 0.01,
+        backend: str = "auto",
+    ):
+        """Analyzes many clips across a process pool.
+
+        Each clip is copied once into a float64 shared-memory block; workers
+        receive only its name and length, never pickled samples. At most
+        ``4 * workers`` clips are in flight, so ``clips`` may be a lazy
+        iterable of any length.
+
+        Args:
+            clips: Iterable of sample sequences, in any form AudioProcessor
+                accepts
+            workers: Worker processes; None uses the CPU count, and 1 runs
+                serially in this process
+            n_bins: Passed to ``analyze``
+            threshold: Passed to ``analyze``
+            backend: Backend each worker analyzes with
+
+        Yields:
+            AudioFeatures for each clip in input order, each as soon as it
+            and every clip before it have finished.
+        """
+        if workers == 1:
+            for clip in clips:
+                yield cls(clip, backend=backend).analyze(n_bins=n_bins, threshold=threshold)
+            return
+
+        workers = workers or os.cpu_count() or 1
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            try:
+                for clip in clips:
+                    block, n = _share_clip(clip)
+                    future = pool.submit(_analyze_shared, block.name, n, n_bins, threshold, backend)
+                    pending.append((future, block))
+                    while pending and (len(pending) >= 4 * workers or pending[0][0].done()):
+                        yield _collect_shared(pending.popleft())
+                while pending:
+                    yield _collect_shared(pending.popleft())
+            finally:
+                # Stopped early: drop queued clips, let running ones finish
+                # detaching, then free every block still held.
+                for future, _ in pending:
+                    future.cancel()
+                for future, block in pending:
+                    if not future.cancelled():
+                        future.exception()
+                    block.close()
+                    block.unlink()
+
+    def _analyze_numpy(self, n_bins: int, threshold: float) -> AudioFeatures:
+        totals = _np_scan(
+            self.samples,
+            peak=True,
+            squares=True,
+            crossings=True,
+            threshold=threshold,
+            n_bins=max(n_bins, 0),
+        )
+        n = totals["n"]
+        rms = _rms(totals["sum_squares"], n)
+        return AudioFeatures(
+            normalize=_peak(totals["max_abs"]),
+            compute_rms=rms,
+            compute_decibels=_decibels(rms),
+            zero_crossing_rate=_crossing_rate(totals["crossings"], n),
+            spectral_centroid_bin=(
+                _centroid_from_magnitudes(totals["magnitudes"]) if n_bins > 0 else 0.0
+            ),
+            silence_ratio=_silence_ratio(totals["silent"], n),
+        )
+
+
+class StreamingAudioProcessor:
+    """Incremental counterpart of AudioProcessor for unbounded input.
+
+    Chunks are fed through ``push``; only running totals are kept, so memory
+    stays constant however much audio has been pushed. Every metric equals
+    what the "python" AudioProcessor backend returns for the concatenation
+    of all chunks pushed so far.
+    """
+
+    def __init__(self, threshold: float = 0.01, n_bins: int = 256):
+        """
+        Args:
+            threshold: Silence threshold, as for ``AudioProcessor.silence_ratio``
+            n_bins: Bins for ``spectral_centroid_bin``; 0 stops tracking the
+                spectrum. Costs 2 * n_bins floats of state.
+        """
+        self.threshold = threshold
+        self.n_bins = n_bins
+        self.n = 0
+        self._max_abs = 0.0
+        self._sum_squares = 0.0
+        self._crossings = 0
+        self._silent = 0
+        self._prev_negative = None
+        self._folded = [0.0] * (2 * n_bins) if n_bins > 0 else None
+        self._fold_pos = 0
+
+    def push(self, chunk) -> None:
+        """
+        Args:
+            chunk: The next samples, in any form AudioProcessor accepts
+        """
+        if np is not None and isinstance(chunk, np.ndarray):
+            chunk = chunk.tolist()
+        threshold = self.threshold
+        folded = self._folded
+        period = len(folded) if folded is not None else 0
+        pos = self._fold_pos
+        max_abs = self._max_abs
+        sum_squares = self._sum_squares
+        crossings = self._crossings
+        silent = self._silent
+        prev_negative = self._prev_negative
+        n = self.n
+        for s in chunk:
+            a = abs(s)
+            if a > max_abs:
+                max_abs = a
+            sum_squares += s * s
+            negative = s < 0
+            if prev_negative is not None and negative != prev_negative:
+                crossings += 1
+            prev_negative = negative
+            if a < threshold:
+                silent += 1
+            if period:
+                folded[pos] += s
+                pos += 1
+                if pos == period:
+                    pos = 0
+            n += 1
+        self._max_abs = max_abs
+        self._sum_squares = sum_squares
+        self._crossings = crossings
+        self._silent = silent
+        self._prev_negative = prev_negative
+        self._fold_pos = pos
+        self.n = n
+
+    def normalize(self) -> float:
+        return _peak(self._max_abs)
+
+    def compute_rms(self) -> float:
+        return _rms(self._sum_squares, self.n)
+
+    def compute_decibels(self) -> float:
+        return _decibels(self.compute_rms())
+
+    def zero_crossing_rate(self) -> float:
+        return _crossing_rate(self._crossings, self.n)
+
+    def spectral_centroid_bin(self) -> float:
+        """
+        Returns:
+            Centroid over the ``n_bins`` given at construction; 0.0 if the
+            spectrum is not being tracked.
+        """
+        if self._folded is None:
+            return 0.0
+        return _centroid_from_magnitudes(_folded_magnitudes(self._folded, self.n_bins))
+
+    def silence_ratio(self) -> float:
+        return _silence_ratio(self._silent, self.n)
+
+    def analyze(self) -> AudioFeatures:
+        """
+        Returns:
+            A snapshot of every metric for the samples pushed so far.
+        """
+        rms = self.compute_rms()
+        return AudioFeatures(
+            normalize=self.normalize(),
+            compute_rms=rms,
+            compute_decibels=_decibels(rms),
+            zero_crossing_rate=self.zero_crossing_rate(),
+            spectral_centroid_bin=self.spectral_centroid_bin(),
+            silence_ratio=self.silence_ratio(),
+        )
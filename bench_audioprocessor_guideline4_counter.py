@@ -0,0 +1,99 @@
+"""Benchmarks AudioProcessor metrics across signal kinds, sizes and backends.
+
+Every run uses fixed seeds, so two runs on the same machine measure the same
+work. Throughput is samples per second; timing, reports and ``--compare``
+come from benchtools.
+
+    python bench_audioprocessor_guideline4_counter.py --sizes 1e6 1e7 --json bench.json
+    python bench_audioprocessor_guideline4_counter.py --compare bench.json
+"""
+
+import argparse
+import math
+import random
+import sys
+from functools import partial
+
+import benchtools
+from audioprocessor_guideline4_counter import BACKENDS, AudioProcessor, np
+
+SIGNALS = ("silence", "dc", "sine", "noise")
+
+# Fields identifying a result row, for --compare.
+KEY = ("backend", "size", "signal", "metric")
+
+# name -> call on an AudioProcessor
+METRICS = {
+    "normalize": lambda ap: ap.normalize(),
+    "compute_rms": lambda ap: ap.compute_rms(),
+    "compute_decibels": lambda ap: ap.compute_decibels(),
+    "zero_crossing_rate": lambda ap: ap.zero_crossing_rate(),
+    "spectral_centroid_bin": lambda ap: ap.spectral_centroid_bin(),
+    "silence_ratio": lambda ap: ap.silence_ratio(),
+    "analyze": lambda ap: ap.analyze(),
+    "frames": lambda ap: ap.frames(2048, 512),
+}
+
+
+def make_signal(kind: str, n: int, backend: str, seed: int = 0):
+    """Synthetic signal in [-1.0, 1.0]: an ndarray for the numpy backend,
+    a list otherwise."""
+    if backend == "numpy":
+        if kind == "silence":
+            return np.zeros(n)
+        if kind == "dc":
+            return np.full(n, 0.5)
+        if kind == "sine":
+            return 0.8 * np.sin(2 * np.pi * 440 / 44100 * np.arange(n))
+        return np.random.default_rng(seed).uniform(-1.0, 1.0, n)
+    if kind == "silence":
+        return [0.0] * n
+    if kind == "dc":
+        return [0.5] * n
+    if kind == "sine":
+        step = 2 * math.pi * 440 / 44100
+        return [0.8 * math.sin(step * i) for i in range(n)]
+    rng = random.Random(seed)
+    return [rng.uniform(-1.0, 1.0) for _ in range(n)]
+
+
+def run(sizes, signals, backends, metrics, repeat: int) -> dict:
+    results = []
+    for backend in backends:
+        for n in sizes:
+            for kind in signals:
+                ap = AudioProcessor(make_signal(kind, n, backend), backend=backend)
+                for metric in metrics:
+                    row = {"backend": backend, "size": n, "signal": kind, "metric": metric}
+                    call = partial(METRICS[metric], ap)
+                    row.update(benchtools.measure(call, len(ap.samples), "samples", repeat))
+                    results.append(row)
+                    print(
+                        f"{backend:6} {n:>11,} {kind:8} {metric:22} "
+                        f"{row['samples_per_sec']:>14,.0f} samples/s "
+                        f"{row['peak_bytes'] / 2**20:>9.2f} MiB",
+                        file=sys.stderr,
+                    )
+                del ap
+    return benchtools.report(results, repeat, np)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e6],
+                        help="signal lengths, e.g. 1e6 1e7 1e8")
+    parser.add_argument("--signals", nargs="+", choices=SIGNALS, default=list(SIGNALS))
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS,
+                        default=[b for b in BACKENDS if b == "python" or np is not None])
+    parser.add_argument("--metrics", nargs="+", choices=tuple(METRICS), default=list(METRICS))
+    benchtools.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if "numpy" in args.backends and np is None:
+        parser.error("the numpy backend needs NumPy installed")
+    report = run([int(n) for n in args.sizes], args.signals, args.backends, args.metrics, args.repeat)
+    return benchtools.finish(args, report, KEY, "samples_per_sec")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Benchmarks the exam statistics library and the problem_B entry points.
+
+Cohorts are synthetic and seeded, so two runs on the same machine measure the
+same work. Throughput is records per second; timing, reports and
+``--compare`` come from benchtools.
+"validate" times validation alone, "summarize" the combined summary, and the
+"*_batch" targets the same calls on a RecordBatch built beforehand. A target
+that returns None on a small cohort, like an unimplemented problem_B, is
+skipped and listed under "skipped" rather than timed.
+
+    python bench_examlib.py --sizes 1e3 1e5 1e7 --json bench_examlib.json
+    python bench_examlib.py --compare bench_examlib.json
+"""
+
+import argparse
+import os
+import random
+import sys
+from functools import partial
+
+import benchtools
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "misc", "src"))
+
+import library as examlib  # noqa: E402
+from problem_B_guideline3_counter import problem_B as problem_B_guideline3  # noqa: E402
+from problem_B_guideline4_counter import problem_B as problem_B_guideline4  # noqa: E402
+
+DISTRIBUTIONS = ("uniform", "ties", "failing", "boundaries", "extreme_weights")
+
+# Fields identifying a result row, for --compare.
+KEY = ("target", "size", "distribution")
+
+# name -> call on (records, batch); batch is the same cohort as a RecordBatch
+TARGETS = {
+    "validate": lambda records, batch: examlib.validate_records(records),
+    "record_batch": lambda records, batch: examlib.RecordBatch.from_records(records),
+    "weighted_average": lambda records, batch: examlib.weighted_average(records),
+    "top_student": lambda records, batch: examlib.top_student(records),
+    "pass_rate": lambda records, batch: examlib.pass_rate(records),
+    "grade_distribution": lambda records, batch: examlib.grade_distribution(records),
+    "summarize": lambda records, batch: examlib.summarize(records),
+    "summarize_batch": lambda records, batch: examlib.summarize(batch),
+    "problem_B_guideline3": lambda records, batch: problem_B_guideline3(records),
+    "problem_B_guideline4": lambda records, batch: problem_B_guideline4(records),
+}
+
+
+def make_cohort(kind: str, n: int, seed: int = 0) -> list:
+    """n valid records with scores and weights drawn according to kind."""
+    rng = random.Random(seed)
+    if kind == "ties":
+        # Every student level: top_student must keep the first record.
+        return [{"name": f"student{i}", "score": 75, "weight": 1.0} for i in range(n)]
+    if kind == "failing":
+        scores = (rng.uniform(0, 49.99) for _ in range(n))
+    elif kind == "boundaries":
+        # Scores exactly on the pass mark and grade boundaries.
+        scores = (rng.choice((0, 49.99, 50, 60, 70, 100)) for _ in range(n))
+    else:
+        scores = (rng.uniform(0, 100) for _ in range(n))
+    if kind == "extreme_weights":
+        weights = (10.0 ** rng.uniform(-12, 12) for _ in range(n))
+    else:
+        weights = (rng.choice((0.5, 1.0, 1.5, 2.0)) for _ in range(n))
+    return [
+        {"name": f"student{i}", "score": s, "weight": w}
+        for i, (s, w) in enumerate(zip(scores, weights))
+    ]
+
+
+def unimplemented(targets) -> list:
+    """The targets that return None: stubs whose timings would mean nothing."""
+    records = make_cohort("uniform", 10)
+    batch = examlib.RecordBatch.from_records(records)
+    return [t for t in targets if TARGETS[t](records, batch) is None]
+
+
+def run(sizes, distributions, targets, repeat: int) -> dict:
+    skipped = unimplemented(targets)
+    for target in skipped:
+        print(f"{target:22} skipped: returns None", file=sys.stderr)
+    targets = [t for t in targets if t not in skipped]
+    results = []
+    for n in sizes:
+        for kind in distributions:
+            records = make_cohort(kind, n)
+            batch = examlib.RecordBatch.from_records(records)
+            for target in targets:
+                row = {"target": target, "size": n, "distribution": kind}
+                call = partial(TARGETS[target], records, batch)
+                row.update(benchtools.measure(call, n, "records", repeat))
+                results.append(row)
+                print(
+                    f"{target:22} {n:>11,} {kind:16} "
+                    f"{row['records_per_sec']:>14,.0f} records/s "
+                    f"{row['peak_bytes'] / 2**20:>9.2f} MiB",
+                    file=sys.stderr,
+                )
+            del records, batch
+    return benchtools.report(results, repeat, examlib.np, skipped=skipped)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e3, 1e4, 1e5],
+                        help="cohort sizes, e.g. 1e3 1e5 1e7")
+    parser.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS,
+                        default=list(DISTRIBUTIONS))
+    parser.add_argument("--targets", nargs="+", choices=tuple(TARGETS), default=list(TARGETS))
+    benchtools.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    report = run([int(n) for n in args.sizes], args.distributions, args.targets, args.repeat)
+    return benchtools.finish(args, report, KEY, "records_per_sec")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Timing, JSON reports and the regression gate shared by the bench_* runners.
+
+A runner supplies its workloads and the fields that identify a result row;
+throughput is items per second from the best of ``--repeat`` timed runs, and
+peak memory is what tracemalloc sees during one extra untimed run.
+"""
+
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+
+def measure(call, n: int, unit: str, repeat: int) -> dict:
+    """Times ``call()`` over ``n`` items, reporting ``<unit>_per_sec``."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": best,
+        f"{unit}_per_sec": n / best if best > 0 else math.inf,
+        "peak_bytes": peak,
+    }
+
+
+def report(results: list, repeat: int, np=None, **extra) -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__ if np is not None else None,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        **extra,
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, key_fields, rate: str, tolerance: float) -> list[str]:
+    """Lists the benchmarks whose ``rate`` fell by more than ``tolerance``
+    (a fraction) relative to ``baseline``; rows are matched on ``key_fields``."""
+    key = lambda r: tuple(r[k] for k in key_fields)
+    before = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = before.get(key(row))
+        if old is None:
+            continue
+        ratio = row[rate] / old[rate]
+        if ratio < 1.0 - tolerance:
+            regressions.append(f"{'/'.join(map(str, key(row)))}: {ratio:.2f}x baseline throughput")
+    return regressions
+
+
+def add_arguments(parser) -> None:
+    """Adds --repeat, --json, --compare and --tolerance, read by ``finish``."""
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write results to this file ('-' for stdout)")
+    parser.add_argument("--compare", help="baseline JSON to check for throughput regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed throughput drop against --compare (default 0.10)")
+
+
+def finish(args, current: dict, key_fields, rate: str) -> int:
+    """Writes ``current`` as --json asks and gates it against --compare;
+    returns the exit status."""
+    if args.json == "-":
+        json.dump(current, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(current, json.load(f), key_fields, rate, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
@@ -0,0 +1,96 @@
+"""
+Streamlit helpers shared by both friends_site apps (each puts the
+repository root on sys.path, as for friend_search).
+
+The friend store, index and ranker are cached per data version: the app's
+example friends, or the file named by FRIENDS_DATA (a .json, .csv or
+SQLite .db file) until its mtime changes. Lists render a page at a time:
+rows_shown says how many rows of a list to show on this rerun and
+load_more_button adds a page, so reruns stay cheap however many friends
+there are.
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+import streamlit as st
+
+from friend_search import FriendIndex, FriendRanker, FriendStore, IncrementalSearch, open_friend_store
+
+# Cached data is reloaded when the file's mtime changes, and at least this
+# often (seconds), which also picks up SQLite writes that leave it unchanged.
+CACHE_TTL = 600
+
+
+def data_version(example: List[Dict]) -> tuple:
+    """Cache key for the current data: (path, mtime, None) for the FRIENDS_DATA
+    file, or (None, None, example) for the app's example friends."""
+    path = os.environ.get("FRIENDS_DATA")
+    if not path:
+        return None, None, example
+    return path, os.path.getmtime(path), None
+
+
+# Store and index are built once per data version, not on every rerun.
+@st.cache_resource(ttl=CACHE_TTL)
+def _load_store(path: Optional[str], mtime: Optional[float], example: Optional[List[Dict]]):
+    return open_friend_store(path) if path else FriendStore(example)
+
+
+@st.cache_resource(ttl=CACHE_TTL)
+def _build_index(path: Optional[str], mtime: Optional[float], example: Optional[List[Dict]]) -> FriendIndex:
+    return FriendIndex(_load_store(path, mtime, example))
+
+
+@st.cache_resource(ttl=CACHE_TTL)
+def _build_ranker(path: Optional[str], mtime: Optional[float], example: Optional[List[Dict]]) -> FriendRanker:
+    return FriendRanker(_load_store(path, mtime, example))
+
+
+def get_store(version: tuple):
+    return _load_store(*version)
+
+
+def get_index(version: tuple) -> FriendIndex:
+    return _build_index(*version)
+
+
+def get_ranker(version: tuple) -> FriendRanker:
+    return _build_ranker(*version)
+
+
+def get_search(version: tuple) -> IncrementalSearch:
+    """This session's search, which reuses its recent results while the user types."""
+    index = get_index(version)
+    search = st.session_state.get("search")
+    if search is None or search.index is not index:
+        search = st.session_state.search = IncrementalSearch(index)
+    return search
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=256)
+def fetch_friends(version: tuple, ids: tuple) -> List[Tuple]:
+    """(id, friend) for the friends shown on a page, read once per page rather
+    than on every rerun; friends deleted since the store was loaded are left out."""
+    friends = _load_store(*version).get_many(ids)
+    return [(fid, friend) for fid, friend in zip(ids, friends) if friend is not None]
+
+
+def rows_shown(name: str, total: int, page_size: int, reset_on=None) -> int:
+    """How many of a list's total rows to render: one page at first, one more
+    per "Load more" click, back to one page when reset_on or page_size changes."""
+    state = st.session_state
+    if state.get(f"{name}_reset") != (reset_on, page_size):
+        state[f"{name}_reset"] = (reset_on, page_size)
+        state[f"{name}_shown"] = page_size
+    return min(state[f"{name}_shown"], total)
+
+
+def _load_more(name: str, page_size: int) -> None:
+    st.session_state[f"{name}_shown"] += page_size
+
+
+def load_more_button(name: str, total: int, shown: int, page_size: int) -> None:
+    if shown < total:
+        st.caption(f"Showing {shown} of {total}")
+        st.button("Load more", key=f"{name}_more", on_click=_load_more, args=(name, page_size))
@@ -0,0 +1,553 @@
+"""
+Friend stores and search index for the friends list, shared by both
+friends_site apps (each puts the repository root on sys.path).
+
+Build a store (open_friend_store for a JSON, CSV or SQLite file) and its
+FriendIndex once per data version (the app caches them with
+st.cache_resource); each rerun then looks friends up by id and answers a
+query from n-gram posting sets instead of scanning every friend.
+FriendRanker answers the same fields by relevance instead, best matches
+first.
+"""
+
+import csv
+import heapq
+import json
+import math
+import re
+import sqlite3
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+FIELDS = ["Name", "Hometown", "Hobbies", "Bio"]
+
+# Queries at least GRAM characters long are answered by intersecting the
+# postings of their n-grams; shorter ones scan the pre-lowered field text.
+GRAM = 3
+
+# Joins a friend's hobbies; a query containing it matches no hobby.
+_SEP = "\n"
+
+
+def _field_text(friend: Dict, field: str) -> str:
+    if field == "Hobbies":
+        return _SEP.join(h.lower() for h in friend["hobbies"])
+    return friend[field.lower()].lower()
+
+
+def _grams(text: str) -> Set[str]:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class FriendStore:
+    """
+    Friends keyed by a stable id: the friend's "id" when it has one, else its
+    position in the list it was built from. Ids stay the same however the
+    friends are searched or paged, unlike names, which need not be unique.
+    """
+
+    def __init__(self, friends: Iterable[Dict]) -> None:
+        self.ids: List[Hashable] = []
+        self._by_id: Dict[Hashable, Dict] = {}
+        for i, f in enumerate(friends):
+            fid = f.get("id", i)
+            if fid in self._by_id:
+                raise ValueError(f"duplicate friend id: {fid!r}")
+            self.ids.append(fid)
+            self._by_id[fid] = f
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, fid: Hashable) -> bool:
+        return fid in self._by_id
+
+    def __getitem__(self, fid: Hashable) -> Dict:
+        return self._by_id[fid]
+
+    def get(self, fid: Hashable) -> Optional[Dict]:
+        return self._by_id.get(fid)
+
+    def get_many(self, ids: Iterable[Hashable]) -> List[Optional[Dict]]:
+        """The friends with ids, in the same order; None for an id not in the store."""
+        return [self._by_id.get(fid) for fid in ids]
+
+    def items(self) -> Iterator[Tuple[Hashable, Dict]]:
+        """(id, friend) pairs in list order."""
+        return ((fid, self._by_id[fid]) for fid in self.ids)
+
+
+# CSV files hold hobbies in one column, separated by this.
+HOBBY_SEP = ";"
+
+_COLUMNS = ("id", "name", "birthday", "hometown", "hobbies", "bio")
+
+
+def load_friends_json(path: str) -> List[Dict]:
+    """A JSON array of friend objects."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_friends_csv(path: str) -> List[Dict]:
+    """A CSV file with a header row; the id column is optional."""
+    with open(path, newline="", encoding="utf-8") as f:
+        friends = list(csv.DictReader(f))
+    for friend in friends:
+        friend["hobbies"] = [h.strip() for h in friend["hobbies"].split(HOBBY_SEP) if h.strip()]
+    return friends
+
+
+def _row_friend(row: Tuple) -> Dict:
+    friend = dict(zip(_COLUMNS, row))
+    friend["hobbies"] = json.loads(friend["hobbies"])
+    return friend
+
+
+class SqliteFriendStore:
+    """
+    Friends in the friends table of a SQLite database, read on demand:
+
+        CREATE TABLE friends (id INTEGER PRIMARY KEY, name TEXT, birthday TEXT,
+                              hometown TEXT, hobbies TEXT, bio TEXT)
+
+    where hobbies holds a JSON list (see save_friends_sqlite). Only the ids
+    are kept in memory; friends are fetched by primary key when shown, a page
+    at a time with get_many. Same interface as FriendStore, except that ids
+    stay those read when the store was built: a friend deleted since is
+    still in ids, but get returns None for it, as get_many does in its place.
+    """
+
+    # SQLite's default limit on parameters per statement is 999.
+    _BATCH = 900
+
+    def __init__(self, path: str) -> None:
+        self._uri = Path(path).resolve().as_uri() + "?mode=ro"
+        with self._connect() as conn:
+            self.ids: List[int] = [fid for fid, in conn.execute("SELECT id FROM friends ORDER BY id")]
+        self._id_set = set(self.ids)
+
+    def _connect(self):
+        # One short-lived read-only connection per call, so a cached store is
+        # safe to share between Streamlit's script threads.
+        return closing(sqlite3.connect(self._uri, uri=True))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, fid: Hashable) -> bool:
+        return fid in self._id_set
+
+    def __getitem__(self, fid: Hashable) -> Dict:
+        friend = self.get(fid)
+        if friend is None:
+            raise KeyError(fid)
+        return friend
+
+    def get(self, fid: Hashable) -> Optional[Dict]:
+        if fid not in self._id_set:
+            return None
+        return self.get_many([fid])[0]
+
+    def get_many(self, ids: Iterable[Hashable]) -> List[Optional[Dict]]:
+        ids = list(ids)
+        found: Dict[int, Dict] = {}
+        with self._connect() as conn:
+            for start in range(0, len(ids), self._BATCH):
+                batch = ids[start:start + self._BATCH]
+                marks = ",".join("?" * len(batch))
+                query = f"SELECT {', '.join(_COLUMNS)} FROM friends WHERE id IN ({marks})"
+                for row in conn.execute(query, batch):
+                    found[row[0]] = _row_friend(row)
+        return [found.get(fid) for fid in ids]
+
+    def items(self) -> Iterator[Tuple[Hashable, Dict]]:
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM friends ORDER BY id")
+            for row in rows:
+                yield row[0], _row_friend(row)
+
+
+def save_friends_sqlite(path: str, friends: Iterable[Dict]) -> None:
+    """Writes friends to a new friends table that SqliteFriendStore can read.
+    Friends without an id are numbered by SQLite."""
+    with closing(sqlite3.connect(path)) as conn, conn:
+        conn.execute(
+            "CREATE TABLE friends (id INTEGER PRIMARY KEY, name TEXT, birthday TEXT,"
+            " hometown TEXT, hobbies TEXT, bio TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO friends VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (f.get("id"), f["name"], f["birthday"], f["hometown"], json.dumps(f["hobbies"]), f["bio"])
+                for f in friends
+            ),
+        )
+
+
+def open_friend_store(path: str):
+    """A FriendStore for a .json or .csv file, a SqliteFriendStore for a
+    .db, .sqlite or .sqlite3 file."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".json":
+        return FriendStore(load_friends_json(path))
+    if suffix == ".csv":
+        return FriendStore(load_friends_csv(path))
+    if suffix in (".db", ".sqlite", ".sqlite3"):
+        return SqliteFriendStore(path)
+    raise ValueError(f"unsupported friends file type: {path}")
+
+
+def _intersect(*sets: Optional[Set[int]]) -> Optional[Set[int]]:
+    # None stands for "every friend".
+    result = None
+    for s in sets:
+        if s is not None:
+            result = s if result is None else result & s
+    return result
+
+
+class FriendIndex:
+    """
+    Case-insensitive substring search over the FIELDS of a friend store, and
+    facets: the friends of each hometown and hobby, with counts.
+
+    Each field indexes its distinct lowered texts once, so a hometown shared
+    by thousands of friends costs one entry, not thousands.
+
+    Queries and filters select sets of friend positions (None meaning every
+    friend), which combine by intersection and become ids with ids_of:
+
+        found = index.match(query, fields)
+        town = index.filter(hometown="Austin, TX")
+        index.ids_of(index.combine(found, town))
+    """
+
+    def __init__(self, store) -> None:
+        # Per field, each distinct lowered text gets a number t: owners[t]
+        # lists the friends (by position) with that text, and postings map an
+        # n-gram to the numbers of the texts containing it. The store is read
+        # in one pass, so a SQLite store is scanned once.
+        self.ids: List[Hashable] = []
+        numbers: Dict[str, Dict[str, int]] = {field: {} for field in FIELDS}
+        owners: Dict[str, List[List[int]]] = {field: [] for field in FIELDS}
+        town_postings: Dict[str, Set[int]] = defaultdict(set)
+        # Hobbies match case-insensitively; each is shown as first spelled.
+        hobby_postings: Dict[str, Set[int]] = defaultdict(set)
+        hobby_names: Dict[str, str] = {}
+        for i, (fid, f) in enumerate(store.items()):
+            self.ids.append(fid)
+            town_postings[f["hometown"]].add(i)
+            for h in f["hobbies"]:
+                hobby_postings[h.lower()].add(i)
+                hobby_names.setdefault(h.lower(), h)
+            for field in FIELDS:
+                text = _field_text(f, field)
+                field_numbers, field_owners = numbers[field], owners[field]
+                if text not in field_numbers:
+                    field_numbers[text] = len(field_owners)
+                    field_owners.append([])
+                field_owners[field_numbers[text]].append(i)
+
+        self._texts: Dict[str, List[str]] = {}
+        self._owners = owners
+        self._postings: Dict[str, Dict[str, Set[int]]] = {}
+        for field in FIELDS:
+            postings: Dict[str, Set[int]] = defaultdict(set)
+            for t, text in enumerate(numbers[field]):
+                for gram in _grams(text):
+                    postings[gram].add(t)
+            self._texts[field] = list(numbers[field])
+            self._postings[field] = dict(postings)
+
+        self._towns = dict(town_postings)
+        self._hobbies = {hobby_names[h]: friends for h, friends in hobby_postings.items()}
+        self._hobby_keys = {h.lower(): h for h in self._hobbies}
+        self.hometowns = sorted(self._towns)
+        self.hobbies = sorted(self._hobbies)
+
+    def search(self, query: str, fields: Iterable[str]) -> List[Hashable]:
+        """
+        Ids, in store order, of the friends with query (lowercased, not
+        stripped) in any of fields; every friend when query is empty.
+        """
+        return self.ids_of(self.match(query, fields))
+
+    def match(self, query: str, fields: Iterable[str]) -> Optional[Set[int]]:
+        """Positions of the friends search() returns; None when query is empty."""
+        if not query:
+            return None
+        return self.owners_of(self.match_texts(query, fields))
+
+    def match_texts(
+        self, query: str, fields: Iterable[str], within: Optional[Dict[str, List[int]]] = None
+    ) -> Dict[str, List[int]]:
+        """
+        Per field, the numbers of the distinct texts containing query
+        (lowercased). within, from an earlier call for the same fields, limits
+        the check to its texts: a text containing query contains every
+        substring of it, so within may come from any non-empty substring.
+        """
+        q = query.lower()
+        matches = {}
+        for field in FIELDS:
+            if field in fields:
+                if within is None:
+                    matches[field] = self._text_matches(field, q)
+                elif field == "Hobbies" and _SEP in q:
+                    matches[field] = []
+                else:
+                    texts = self._texts[field]
+                    matches[field] = [t for t in within[field] if q in texts[t]]
+        return matches
+
+    def owners_of(self, matches: Dict[str, List[int]]) -> Set[int]:
+        """Positions of the friends owning the texts of match_texts()."""
+        found: Set[int] = set()
+        for field, numbers in matches.items():
+            owners = self._owners[field]
+            for t in numbers:
+                found.update(owners[t])
+        return found
+
+    def filter(self, hometown: Optional[str] = None, hobbies: Iterable[str] = ()) -> Optional[Set[int]]:
+        """
+        Positions of the friends from hometown (if given) with at least one
+        of hobbies (if any, case-insensitive); None when neither is given.
+        """
+        by_town = None if hometown is None else self._towns.get(hometown, set())
+        by_hobby = None
+        for h in hobbies:
+            friends = self._hobbies.get(self._hobby_keys.get(h.lower()), set())
+            by_hobby = friends if by_hobby is None else by_hobby | friends
+        return _intersect(by_town, by_hobby)
+
+    combine = staticmethod(_intersect)
+
+    def ids_of(self, positions: Optional[Set[int]]) -> List[Hashable]:
+        """Ids of positions (every friend for None), in store order."""
+        if positions is None:
+            return list(self.ids)
+        ids = self.ids
+        return [ids[i] for i in sorted(positions)]
+
+    def count(self, positions: Optional[Set[int]]) -> int:
+        return len(self.ids) if positions is None else len(positions)
+
+    def hometown_counts(self, within: Optional[Set[int]] = None) -> Dict[str, int]:
+        """Friends per hometown, counting only positions within (if given)."""
+        return self._counts(self._towns, within)
+
+    def hobby_counts(self, within: Optional[Set[int]] = None) -> Dict[str, int]:
+        """Friends per hobby, counting only positions within (if given)."""
+        return self._counts(self._hobbies, within)
+
+    @staticmethod
+    def _counts(facet: Dict[str, Set[int]], within: Optional[Set[int]]) -> Dict[str, int]:
+        if within is None:
+            return {value: len(friends) for value, friends in facet.items()}
+        return {value: len(friends & within) for value, friends in facet.items()}
+
+    def _text_matches(self, field: str, q: str) -> List[int]:
+        texts = self._texts[field]
+        if field == "Hobbies" and _SEP in q:
+            return []
+        if len(q) < GRAM:
+            return [t for t, text in enumerate(texts) if q in text]
+        postings = self._postings[field]
+        # Rarest n-gram first keeps the intersections small.
+        grams = sorted(_grams(q), key=lambda g: len(postings.get(g, ())))
+        candidates = postings.get(grams[0], set())
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates = candidates & postings.get(gram, set())
+        # Sharing every n-gram does not make q a substring; confirm.
+        return [t for t in candidates if q in texts[t]]
+
+
+class IncrementalSearch:
+    """
+    Search over a FriendIndex for one user typing a query, keeping the last
+    size results (least recently used dropped first).
+
+    A query that extends a remembered one, say "ann" after "an", only
+    rechecks the friends that matched the shorter query, and going back to a
+    remembered query (or filter) answers from memory. The app keeps one per
+    session and replaces it when the index is rebuilt.
+    """
+
+    def __init__(self, index: FriendIndex, size: int = 32) -> None:
+        self.index = index
+        self.size = size
+        self._matches: "OrderedDict[Tuple, Tuple[Dict[str, List[int]], Set[int]]]" = OrderedDict()
+        self._results: "OrderedDict[Tuple, List[Hashable]]" = OrderedDict()
+
+    def match(self, query: str, fields: Iterable[str]) -> Optional[Set[int]]:
+        """FriendIndex.match(query, fields), narrowed from an earlier result when possible."""
+        q = query.lower()
+        if not q:
+            return None
+        fields = tuple(field for field in FIELDS if field in fields)
+        key = (q, fields)
+        if key in self._matches:
+            self._matches.move_to_end(key)
+            return self._matches[key][1]
+        # Texts containing q contain every substring of q, so the texts
+        # matched by a remembered substring are the only ones to recheck.
+        within = None
+        for (earlier, earlier_fields), (texts, _) in self._matches.items():
+            if earlier_fields == fields and earlier in q:
+                if within is None or sum(map(len, texts.values())) < sum(map(len, within.values())):
+                    within = texts
+        texts = self.index.match_texts(q, fields, within)
+        found = self.index.owners_of(texts)
+        self._remember(self._matches, key, (texts, found))
+        return found
+
+    def search(
+        self, query: str, fields: Iterable[str], hometown: Optional[str] = None, hobbies: Iterable[str] = ()
+    ) -> List[Hashable]:
+        """Ids, in store order, of the friends matching query and the filters (see FriendIndex.filter)."""
+        fields, hobbies = tuple(fields), tuple(hobbies)
+        key = (query.lower(), frozenset(fields), hometown, frozenset(h.lower() for h in hobbies))
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key]
+        index = self.index
+        found = index.combine(self.match(query, fields), index.filter(hometown, hobbies))
+        ids = index.ids_of(found)
+        self._remember(self._results, key, ids)
+        return ids
+
+    def _remember(self, cache: OrderedDict, key: Tuple, value) -> None:
+        cache[key] = value
+        if len(cache) > self.size:
+            cache.popitem(last=False)
+
+
+# Field weights for ranking: a word in a name says more than one in a bio.
+FIELD_WEIGHTS = {"Name": 3.0, "Hometown": 2.0, "Hobbies": 2.0, "Bio": 1.0}
+
+# BM25 saturation of repeated words, and how much field length discounts them.
+K1 = 1.2
+B = 0.75
+
+# A query word also matches vocabulary words sharing at least this fraction
+# of their trigrams with it, when typos are allowed (see FriendRanker.scores).
+TYPO_SIMILARITY = 0.3
+
+# Most similar vocabulary words tried per query word.
+TYPO_VARIANTS = 5
+
+_WORD = re.compile(r"\w+")
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def _trigrams(word: str) -> Set[str]:
+    padded = f"^{word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FriendRanker:
+    """
+    Relevance-ranked search over the words of a friend store's FIELDS.
+
+    Friends are scored with BM25F: each query word counts for its
+    weighted, length-normalised frequency across the chosen fields, scaled
+    by how rare the word is. A word that is not in any friend's text can be
+    matched to similarly spelt ones through a trigram index of the
+    vocabulary. The best k come from a heap rather than a full sort:
+
+        scores = ranker.scores("hiking dublin", FIELDS, typos=True)
+        ranker.top(scores, 10)  # [(id, score), ...], best first
+    """
+
+    def __init__(self, store, weights: Optional[Dict[str, float]] = None) -> None:
+        self.weights = dict(FIELD_WEIGHTS if weights is None else weights)
+        self.ids: List[Hashable] = []
+        # Per field: word -> [(position, count)], and each friend's word count.
+        self._postings: Dict[str, Dict[str, List[Tuple[int, int]]]] = {
+            field: defaultdict(list) for field in FIELDS
+        }
+        self._lengths: Dict[str, List[int]] = {field: [] for field in FIELDS}
+        for i, (fid, f) in enumerate(store.items()):
+            self.ids.append(fid)
+            for field in FIELDS:
+                words = _words(_field_text(f, field))
+                self._lengths[field].append(len(words))
+                postings = self._postings[field]
+                for word, count in Counter(words).items():
+                    postings[word].append((i, count))
+        self._average = {
+            field: (sum(lengths) / len(lengths) if lengths else 0.0) or 1.0
+            for field, lengths in self._lengths.items()
+        }
+        self._vocabulary: Dict[str, Set[str]] = defaultdict(set)
+        for postings in self._postings.values():
+            for word in postings:
+                for gram in _trigrams(word):
+                    self._vocabulary[gram].add(word)
+
+    def scores(self, query: str, fields: Iterable[str], typos: bool = False) -> Dict[int, float]:
+        """
+        BM25F score of each friend (by position) matching a word of query in
+        fields. With typos, a query word missing from the vocabulary matches
+        its closest spellings instead, each scaled by its similarity.
+        """
+        fields = [field for field in FIELDS if field in fields]
+        n = len(self.ids)
+        scores: Dict[int, float] = defaultdict(float)
+        for word, repeats in Counter(_words(query)).items():
+            # A friend matching several spellings counts the best one.
+            best: Dict[int, float] = {}
+            for variant, similarity in self._variants(word, fields, typos):
+                weighted = self._weighted_counts(variant, fields)
+                df = len(weighted)
+                idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+                for i, tf in weighted.items():
+                    score = similarity * idf * tf * (K1 + 1.0) / (K1 + tf)
+                    if score > best.get(i, 0.0):
+                        best[i] = score
+            for i, score in best.items():
+                scores[i] += repeats * score
+        return dict(scores)
+
+    def top(self, scores: Dict[int, float], k: int, within: Optional[Set[int]] = None) -> List[Tuple[Hashable, float]]:
+        """
+        The k best (id, score) pairs of scores, best first; ties keep store
+        order. within, if given, limits them to those positions.
+        """
+        items = scores.items() if within is None else ((i, scores[i]) for i in within if i in scores)
+        best = heapq.nlargest(k, items, key=lambda item: (item[1], -item[0]))
+        return [(self.ids[i], score) for i, score in best]
+
+    def _weighted_counts(self, word: str, fields: List[str]) -> Dict[int, float]:
+        weighted: Dict[int, float] = defaultdict(float)
+        for field in fields:
+            postings = self._postings[field].get(word)
+            if not postings:
+                continue
+            weight, lengths, average = self.weights[field], self._lengths[field], self._average[field]
+            for i, count in postings:
+                weighted[i] += weight * count / (1.0 - B + B * lengths[i] / average)
+        return weighted
+
+    def _variants(self, word: str, fields: List[str], typos: bool) -> List[Tuple[str, float]]:
+        if not typos or any(word in self._postings[field] for field in fields):
+            return [(word, 1.0)]
+        grams = _trigrams(word)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._vocabulary.get(gram, ()))
+        similar = []
+        for other, common in shared.items():
+            similarity = common / (len(grams) + len(_trigrams(other)) - common)
+            if similarity >= TYPO_SIMILARITY and any(other in self._postings[field] for field in fields):
+                similar.append((other, similarity))
+        return heapq.nlargest(TYPO_VARIANTS, similar, key=lambda item: (item[1], item[0]))
@@ -5,10 +5,22 @@ Simple social media demo built with Streamlit
 - Right column: selected friend's full profile (only one shown at a time)
 
 Run: pip install -r requirements.txt && streamlit run streamlit_app.py
+Set FRIENDS_DATA to a .json, .csv or SQLite (.db) file to load friends from it
+instead of the example list, e.g. FRIENDS_DATA=friends.db streamlit run streamlit_app.py
 """
 
+import os
+import sys
 import streamlit as st
-from typing import List, Dict
+from typing import List, Dict, Optional, Set
+
+# friend_search and friend_app are shared with the other friends site, at the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from friend_app import (
+    data_version, fetch_friends, get_index, get_ranker, get_search, get_store, load_more_button, rows_shown,
+)
+from friend_search import FIELDS
 
 st.set_page_config(page_title="Simple Social — Streamlit", layout="wide")
 
@@ -73,38 +85,25 @@ FRIENDS: List[Dict] = [
 
 # --- helpers ---
 
-def search_friends(query: str, fields: List[str], hometown: str, hobby_filters: List[str]) -> List[Dict]:
-    q = query.strip().lower()
-    results: List[Dict] = []
-    for f in FRIENDS:
-        # hometown filter
-        if hometown != "All" and f["hometown"] != hometown:
-            continue
-        # hobby filters: if provided, require at least one match
-        if hobby_filters:
-            lowered = [h.lower() for h in f["hobbies"]]
-            if not any(h.lower() in lowered for h in hobby_filters):
-                continue
-        # empty query -> include (after filters above)
-        if not q:
-            results.append(f)
-            continue
-        matched = False
-        if "Name" in fields and q in f["name"].lower():
-            matched = True
-        if "Hometown" in fields and q in f["hometown"].lower():
-            matched = True
-        if "Hobbies" in fields and any(q in h.lower() for h in f["hobbies"]):
-            matched = True
-        if "Bio" in fields and q in f["bio"].lower():
-            matched = True
-        if matched:
-            results.append(f)
-    return results
+def match_friends(query: str, fields: List[str]) -> Optional[Set[int]]:
+    """Index positions of the friends matching query; None matches everyone."""
+    return get_search(version).match(query.strip(), fields)
+
+
+def search_friends(query: str, fields: List[str], hometown: str, hobby_filters: List[str]) -> List:
+    """Ids of the matching friends, in list order."""
+    return get_search(version).search(query.strip(), fields, None if hometown == "All" else hometown, hobby_filters)
 
 # --- session state ---
-if "selected_friend" not in st.session_state:
-    st.session_state.selected_friend = None
+# Holds the selected friend's id, so the profile is one store lookup.
+if "selected_id" not in st.session_state:
+    st.session_state.selected_id = None
+
+version = data_version(FRIENDS)
+store = get_store(version)
+
+# Lists render a page at a time, so reruns stay cheap however many friends there are.
+page_size = st.sidebar.selectbox("Rows per page", [25, 50, 100, 250])
 
 # --- layout: three columns ---
 left_col, mid_col, right_col = st.columns([1, 2, 2])
@@ -112,37 +111,78 @@ left_col, mid_col, right_col = st.columns([1, 2, 2])
 # LEFT: friend names (each in its own clickable box)
 with left_col:
     st.header("Friends")
-    for i, fr in enumerate(FRIENDS):
-        if st.button(fr["name"], key=f"left_{i}"):
-            st.session_state.selected_friend = fr["name"]
+    shown = rows_shown("left", len(store), page_size)
+    page = store.ids[:shown]
+    for fid, fr in fetch_friends(version, tuple(page)):
+        if st.button(fr["name"], key=f"left_{fid}"):
+            st.session_state.selected_id = fid
+    load_more_button("left", len(store), shown, page_size)
 
 # MIDDLE: search bar + options + results
 with mid_col:
     st.header("Search")
     query = st.text_input("Search text", value="", key="query_input")
-    search_fields = st.multiselect("Search in", ["Name", "Hometown", "Hobbies", "Bio"], default=["Name", "Hometown"])
+    search_fields = st.multiselect("Search in", FIELDS, default=["Name", "Hometown"])
+    ranked = st.checkbox("Best matches first", help="Match whole words and rank friends by relevance.")
+    typos = st.checkbox("Allow typos", disabled=not ranked)
+
+    index = get_index(version)
+    if ranked and query.strip():
+        # Ranker and index number friends alike: by position in the store.
+        scores = get_ranker(version).scores(query, search_fields, typos=typos)
+        found = set(scores)
+    else:
+        found = match_friends(query, search_fields)
+    # Each option counts the friends it would leave, given the query and the
+    # other filter; counts come from the index's posting sets, not a scan.
+    hometown_filter = st.session_state.get("hometown_filter", "All")
+    hobby_filter = st.session_state.get("hobby_filter", [])
+    town = index.filter(hometown=None if hometown_filter == "All" else hometown_filter)
+    hobbies = index.filter(hobbies=hobby_filter)
+    town_counts = index.hometown_counts(index.combine(found, hobbies))
+    hobby_counts = index.hobby_counts(index.combine(found, town))
+    town_total = index.count(index.combine(found, hobbies))
 
-    hometown_options = ["All"] + sorted({f["hometown"] for f in FRIENDS})
-    hometown_filter = st.selectbox("Hometown filter", hometown_options)
+    hometown_options = ["All"] + index.hometowns
+    hometown_filter = st.selectbox(
+        "Hometown filter", hometown_options, key="hometown_filter",
+        format_func=lambda h: f"{h} ({town_total if h == 'All' else town_counts[h]})",
+    )
 
-    all_hobbies = sorted({h for f in FRIENDS for h in f["hobbies"]})
-    hobby_filter = st.multiselect("Filter by hobby (optional)", all_hobbies, default=[])
+    hobby_filter = st.multiselect(
+        "Filter by hobby (optional)", index.hobbies, default=[], key="hobby_filter",
+        format_func=lambda h: f"{h} ({hobby_counts[h]})",
+    )
 
-    results = search_friends(query, search_fields, hometown_filter, hobby_filter)
+    search_key = (query, tuple(search_fields), hometown_filter, tuple(hobby_filter), ranked, typos)
+    if ranked and query.strip():
+        # Only the rows shown are ranked, from a heap over the matches.
+        town = index.filter(hometown=None if hometown_filter == "All" else hometown_filter)
+        within = index.combine(found, town, index.filter(hobbies=hobby_filter))
+        total = len(within)
+        shown = rows_shown("results", total, page_size, reset_on=search_key)
+        page = [fid for fid, _ in get_ranker(version).top(scores, shown, within)]
+    else:
+        results = search_friends(query, search_fields, hometown_filter, hobby_filter)
+        total = len(results)
+        shown = rows_shown("results", total, page_size, reset_on=search_key)
+        page = results[:shown]
 
-    st.markdown(f"**Results — {len(results)}**")
-    for idx, r in enumerate(results):
+    st.markdown(f"**Results — {total}**")
+    for fid, r in fetch_friends(version, tuple(page)):
         card = st.container()
         c1, c2 = card.columns([3, 1])
         c1.markdown(f"**{r['name']}**  \n{r['birthday']} · {r['hometown']}")
-        if c2.button("View", key=f"view_{idx}"):
-            st.session_state.selected_friend = r['name']
+        # Keyed by the friend, not the row, so keys survive paging and new queries.
+        if c2.button("View", key=f"view_{fid}"):
+            st.session_state.selected_id = fid
+    load_more_button("results", total, shown, page_size)
 
 # RIGHT: full profile (only one friend shown at a time)
 with right_col:
     st.header("Profile")
-    if st.session_state.selected_friend:
-        friend = next((f for f in FRIENDS if f["name"] == st.session_state.selected_friend), None)
+    if st.session_state.selected_id is not None:
+        friend = store.get(st.session_state.selected_id)
         if friend:
             st.subheader(friend["name"])
             st.write(f"**Birthday:** {friend['birthday']}")
@@ -1,5 +1,14 @@
+import os
+import sys
+
 import streamlit as st
 
+# friend_search and friend_app are shared with the other friends site, at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from friend_app import data_version, fetch_friends, get_ranker, get_search, get_store, load_more_button, rows_shown
+from friend_search import FIELDS
+
 st.set_page_config(page_title="Friends — Social Demo", layout="wide")
 
 # ----- Example friends data (name, birthday, hometown, 3 hobbies, short bio <= 30 words) -----
@@ -48,26 +57,41 @@ FRIENDS = [
     }
 ]
 
-# initialize selection
-if "selected" not in st.session_state:
-    st.session_state.selected = 0
+
+# set FRIENDS_DATA to a .json, .csv or SQLite (.db) file to load friends from it instead
+version = data_version(FRIENDS)
+store = get_store(version)
+if not len(store):
+    st.warning("No friends loaded.")
+    st.stop()
+
+# initialize selection (by friend id, so showing it is one store lookup);
+# reloaded data may no longer have the selected friend
+if st.session_state.get("selected_id") not in store:
+    st.session_state.selected_id = store.ids[0]
 if "show_right" not in st.session_state:
     st.session_state.show_right = False
 
 st.title("Simple Friends — Social Demo")
 st.caption("A minimal Streamlit social-style layout — 3 columns")
 
+# lists render a page at a time, so reruns stay cheap however many friends there are
+page_size = st.sidebar.selectbox("Rows per page", [25, 50, 100, 250])
+
 # layout: left (friends list), center (details), right (meta / actions)
 col1, col2, col3 = st.columns([1, 2, 1])
 
 # LEFT: show each friend as just their name in its own box (clickable)
 with col1:
     st.header("Friends")
-    for idx, friend in enumerate(FRIENDS):
+    shown = rows_shown("friends", len(store), page_size)
+    page = store.ids[:shown]
+    for fid, friend in fetch_friends(version, tuple(page)):
         # each name shown in its own button (box-like UI)
-        if st.button(friend["name"], key=f"friend_{idx}"):
-            st.session_state.selected = idx
+        if st.button(friend["name"], key=f"friend_{fid}"):
+            st.session_state.selected_id = fid
             st.session_state.show_right = True
+    load_more_button("friends", len(store), shown, page_size)
 
 # CENTER: search + selected friend's full details
 with col2:
@@ -76,30 +100,29 @@ with col2:
     # --- Search bar and options (top of middle column)
     query = st.text_input("Search friends", key="search_query",
                           placeholder="type name, hometown, hobby, or keyword from bio")
-    search_fields = st.multiselect("Search in", ["Name", "Hometown", "Hobbies", "Bio"],
+    search_fields = st.multiselect("Search in", FIELDS,
                                    default=["Name", "Hometown"], help="Choose fields to include in the search.")
+    ranked = st.checkbox("Best matches first", help="Match whole words and rank friends by relevance.")
+    typos = st.checkbox("Allow typos", disabled=not ranked)
 
     # perform search when query provided
-    def _matches(friend, q, fields):
-        q = q.lower()
-        if "Name" in fields and q in friend["name"].lower():
-            return True
-        if "Hometown" in fields and q in friend["hometown"].lower():
-            return True
-        if "Hobbies" in fields:
-            for h in friend["hobbies"]:
-                if q in h.lower():
-                    return True
-        if "Bio" in fields and q in friend["bio"].lower():
-            return True
-        return False
-
     if query and query.strip():
-        results = [f for f in FRIENDS if _matches(f, query, search_fields)]
-        st.markdown(f"**Search results — {len(results)} match(es)**")
+        reset_on = (query, tuple(search_fields), ranked, typos)
+        if ranked:
+            # only the rows shown are ranked, from a heap over the matches
+            scores = get_ranker(version).scores(query, search_fields, typos=typos)
+            total = len(scores)
+            shown = rows_shown("results", total, page_size, reset_on=reset_on)
+            page = [fid for fid, _ in get_ranker(version).top(scores, shown)]
+        else:
+            results = get_search(version).search(query, search_fields)
+            total = len(results)
+            shown = rows_shown("results", total, page_size, reset_on=reset_on)
+            page = results[:shown]
+        st.markdown(f"**Search results — {total} match(es)**")
 
         # show each result reference (name, birthday, hometown) with a View button
-        for i, friend in enumerate(results):
+        for fid, friend in fetch_friends(version, tuple(page)):
             r1, r2, r3, r4 = st.columns([3, 2, 3, 1])
             with r1:
                 st.markdown(f"**{friend['name']}**")
@@ -108,29 +131,35 @@ with col2:
             with r3:
                 st.write(friend["hometown"])
             with r4:
-                if st.button("View", key=f"view_search_{i}"):
-                    st.session_state.selected = FRIENDS.index(friend)
+                # keyed by the friend, not the row, so keys survive paging and new queries
+                if st.button("View", key=f"view_search_{fid}"):
+                    st.session_state.selected_id = fid
                     st.session_state.show_right = True
             st.markdown("---")
+        load_more_button("results", total, shown, page_size)
 
-        if not results:
+        if not total:
             st.info("No friends match your search.")
 
     # --- always show currently selected friend's full details below the results / search
-    selected = FRIENDS[st.session_state.selected]
-    st.subheader(selected["name"])
-    st.write(f"**Birthday:** {selected['birthday']}")
-    st.write(f"**Hometown:** {selected['hometown']}")
-    st.write("**Hobbies:**")
-    st.write(", ".join(selected["hobbies"]))
-    st.markdown("---")
-    st.write("**About**")
-    st.write(selected["bio"])
+    # a SQLite row may have been deleted since the store was loaded
+    selected = store.get(st.session_state.selected_id)
+    if selected is None:
+        st.info("Selected friend not found.")
+    else:
+        st.subheader(selected["name"])
+        st.write(f"**Birthday:** {selected['birthday']}")
+        st.write(f"**Hometown:** {selected['hometown']}")
+        st.write("**Hobbies:**")
+        st.write(", ".join(selected["hobbies"]))
+        st.markdown("---")
+        st.write("**About**")
+        st.write(selected["bio"])
 
 # RIGHT: show full info for a clicked friend (only one at a time)
 with col3:
-    if st.session_state.get("show_right", False):
-        friend = FRIENDS[st.session_state.selected]
+    friend = store.get(st.session_state.selected_id)
+    if st.session_state.get("show_right", False) and friend is not None:
         st.header("Friend details")
         st.subheader(friend["name"])
         st.write(f"**Birthday:** {friend['birthday']}")
@@ -147,7 +176,7 @@ with col3:
             st.session_state.show_right = False
     else:
         st.header("Profile")
-        st.metric("Friends loaded", len(FRIENDS))
+        st.metric("Friends loaded", len(store))
         st.markdown("**Quick actions**")
         st.button("Send message", key="send_msg_default")
         st.button("Follow", key="follow_default")
@@ -4,99 +4,470 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Mapping, Optional
+import csv
+import json
+import math
+import os
+import sys
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from heapq import nlargest
+from itertools import chain, compress, islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; every function has a pure-Python path.
+    np = None
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Only the Parquet loaders need pyarrow.
+    pq = None
+
+# Batches at least this large are aggregated with NumPy when it is installed.
+# Both paths return identical results; below this NumPy's overhead dominates.
+_NUMPY_MIN_RECORDS = 256
+
+# Every integer up to this magnitude converts to float exactly.
+_FLOAT_EXACT_INT = 2**53
 
 
 class InvalidRecordError(ValueError):
     """Raised when an input record is missing fields or has invalid values."""
 
 
-def _to_record_list(records: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
-    # Ensure we can iterate multiple times and give nicer errors for non-iterables.
+class MultipleRecordErrors(InvalidRecordError):
+    """Raised when validating with collect_errors=True; .errors holds the error of
+    every invalid record, in input order."""
+
+    def __init__(self, errors: List[InvalidRecordError]) -> None:
+        self.errors = errors
+        super().__init__(f"{len(errors)} invalid record(s): " + "; ".join(map(str, errors)))
+
+    def __reduce__(self):
+        # Rebuild from the error list, e.g. when raised in a worker process.
+        return type(self), (self.errors,)
+
+
+class AmbiguousRoundingError(ArithmeticError):
+    """Raised by ExamStatsAccumulator.snapshot() when its exact weighted mean
+    lies so close to a rounding boundary that summarize(), which sums in
+    record order, might round the same records the other way."""
+
+
+def _check_record(i: int, r: Mapping[str, Any]) -> Tuple[str, float, float]:
+    # Required keys
+    for k in ("name", "score", "weight"):
+        if k not in r:
+            raise InvalidRecordError(f"record {i} missing required field: {k}")
+    return _check_values(i, r["name"], r["score"], r["weight"])
+
+
+def _check_values(i: int, name: Any, score: Any, weight: Any) -> Tuple[str, float, float]:
+    # Name
+    if not isinstance(name, str) or not name.strip():
+        raise InvalidRecordError(f"record {i} name must be a non-empty string")
+
+    # Score
+    if not isinstance(score, (int, float)):
+        raise InvalidRecordError(f"record {i} score must be a number")
+    if score != score:  # NaN check
+        raise InvalidRecordError(f"record {i} score cannot be NaN")
+    if score < 0 or score > 100:
+        raise InvalidRecordError(f"record {i} score must be between 0 and 100")
+
+    # Weight
+    if not isinstance(weight, (int, float)):
+        raise InvalidRecordError(f"record {i} weight must be a number")
+    if weight != weight:  # NaN check
+        raise InvalidRecordError(f"record {i} weight cannot be NaN")
+    if weight <= 0:
+        raise InvalidRecordError(f"record {i} weight must be > 0")
+    if isinstance(weight, int) and not _holds_exactly(weight):
+        raise InvalidRecordError(f"record {i} weight is too large an integer to convert to float exactly")
+
+    return name, score, weight
+
+
+def _holds_exactly(value: int) -> bool:
+    # Whether float(value) == value; weights are summed as floats, so larger
+    # integers would be silently rounded (or overflow).
+    if -_FLOAT_EXACT_INT <= value <= _FLOAT_EXACT_INT:
+        return True
+    try:
+        return float(value) == value
+    except OverflowError:
+        return False
+
+
+def _checked_rows(
+    records: Iterable[Mapping[str, Any]],
+    errors: Optional[List[InvalidRecordError]] = None,
+    start: int = 0,
+):
+    # Yields (record, name, score, weight) for each valid record, one at a time,
+    # numbering records from start in error messages. With an errors list,
+    # invalid records are skipped and their errors appended instead of raised.
     if records is None:
         raise InvalidRecordError("records cannot be None")
     try:
-        return [dict(r) for r in records]
+        rows = iter(records)
     except TypeError as e:
         raise InvalidRecordError("records must be an iterable of dict-like objects") from e
 
+    for i, r in enumerate(rows, start):
+        try:
+            if not isinstance(r, Mapping):
+                try:
+                    r = dict(r)
+                except TypeError as e:
+                    raise InvalidRecordError("records must be an iterable of dict-like objects") from e
+            name, score, weight = _check_record(i, r)
+        except InvalidRecordError as e:
+            if errors is None:
+                raise
+            errors.append(e)
+            continue
+        yield r, name, score, weight
 
-def validate_records(records: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
-    recs = _to_record_list(records)
-    if len(recs) == 0:
+
+def _finish_checks(count: int, errors: Optional[List[InvalidRecordError]]) -> None:
+    # Raised once the input is exhausted: collected errors, else emptiness.
+    if errors:
+        raise MultipleRecordErrors(errors)
+    if count == 0:
         raise InvalidRecordError("record list cannot be empty")
 
-    for i, r in enumerate(recs):
-        # Required keys
-        for k in ("name", "score", "weight"):
-            if k not in r:
-                raise InvalidRecordError(f"record {i} missing required field: {k}")
-
-        # Name
-        if not isinstance(r["name"], str) or not r["name"].strip():
-            raise InvalidRecordError(f"record {i} name must be a non-empty string")
-
-        # Score
-        score = r["score"]
-        if not isinstance(score, (int, float)):
-            raise InvalidRecordError(f"record {i} score must be a number")
-        if score != score:  # NaN check
-            raise InvalidRecordError(f"record {i} score cannot be NaN")
-        if score < 0 or score > 100:
-            raise InvalidRecordError(f"record {i} score must be between 0 and 100")
-
-        # Weight
-        weight = r["weight"]
-        if not isinstance(weight, (int, float)):
-            raise InvalidRecordError(f"record {i} weight must be a number")
-        if weight != weight:  # NaN check
-            raise InvalidRecordError(f"record {i} weight cannot be NaN")
-        if weight <= 0:
-            raise InvalidRecordError(f"record {i} weight must be > 0")
-
-    return recs
-
-
-def weighted_average(records: Iterable[Mapping[str, Any]]) -> float:
-    recs = validate_records(records)
-    total_weight = sum(r["weight"] for r in recs)
-    weighted_sum = sum(r["score"] * r["weight"] for r in recs)
+
+def iter_validated(
+    records: Iterable[Mapping[str, Any]],
+    *,
+    collect_errors: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Validates records lazily, yielding a dict copy of each valid record as soon
+    as it has been checked, so generators over large sources are never
+    buffered. Errors carry the same messages and record indices as
+    validate_records.
+
+    By default the first invalid record raises InvalidRecordError. With
+    collect_errors=True, invalid records are skipped, and MultipleRecordErrors
+    listing all of them is raised after the last record. Memory then grows only
+    with the number of invalid records.
+    """
+    errors: Optional[List[InvalidRecordError]] = [] if collect_errors else None
+    count = 0
+    for r, _, _, _ in _checked_rows(records, errors):
+        count += 1
+        yield dict(r)
+    _finish_checks(count, errors)
+
+
+def validate_records(
+    records: Iterable[Mapping[str, Any]],
+    *,
+    collect_errors: bool = False,
+) -> List[Dict[str, Any]]:
+    return list(iter_validated(records, collect_errors=collect_errors))
+
+
+class RecordBatch:
+    """
+    Validated records stored column-wise: names in a list, scores and weights
+    in array('d') columns.
+
+    Build one with from_records() or from_columns(); both apply the same checks
+    as validate_records. Every statistics function accepts a RecordBatch as
+    its records argument and uses the columns directly, without copying or
+    re-validating, so validate once and reuse the batch across calls.
+
+    Scores and weights are stored as floats; integer weights a float cannot
+    hold exactly are rejected.
+    """
+
+    __slots__ = ("names", "scores", "weights")
+
+    def __init__(self, names: List[str], scores: array, weights: array) -> None:
+        # Trusted constructor: columns must already be validated.
+        self.names = names
+        self.scores = scores
+        self.weights = weights
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Mapping[str, Any]],
+        *,
+        collect_errors: bool = False,
+    ) -> "RecordBatch":
+        if isinstance(records, RecordBatch):
+            return records
+        errors: Optional[List[InvalidRecordError]] = [] if collect_errors else None
+        names: List[str] = []
+        scores = array("d")
+        weights = array("d")
+        for _, name, score, weight in _checked_rows(records, errors):
+            names.append(name)
+            scores.append(score)
+            weights.append(weight)
+        _finish_checks(len(names), errors)
+        return cls(names, scores, weights)
+
+    @classmethod
+    def from_columns(
+        cls,
+        names: Iterable[str],
+        scores: Iterable[float],
+        weights: Iterable[float],
+    ) -> "RecordBatch":
+        """
+        Builds a batch from parallel columns. Numeric NumPy columns are checked
+        with whole-column operations and kept as float64 arrays; errors name
+        the same record index and message as validate_records would.
+        """
+        names = list(names)
+        if np is not None and isinstance(scores, np.ndarray) and isinstance(weights, np.ndarray):
+            batch = cls._from_numpy_columns(names, scores, weights)
+            if batch is not None:
+                return batch
+        scores = list(scores)
+        weights = list(weights)
+        if not (len(names) == len(scores) == len(weights)):
+            raise InvalidRecordError("names, scores and weights must have the same length")
+        if not names:
+            raise InvalidRecordError("record list cannot be empty")
+        for i, (name, score, weight) in enumerate(zip(names, scores, weights)):
+            _check_values(i, name, score, weight)
+        return cls(names, array("d", scores), array("d", weights))
+
+    @classmethod
+    def _from_numpy_columns(cls, names: List[str], scores, weights) -> Optional["RecordBatch"]:
+        # None means the columns need the per-value checks (e.g. object dtype).
+        numeric = "biuf"
+        if scores.ndim != 1 or weights.ndim != 1:
+            return None
+        if scores.dtype.kind not in numeric or weights.dtype.kind not in numeric:
+            return None
+        if not (len(names) == len(scores) == len(weights)):
+            raise InvalidRecordError("names, scores and weights must have the same length")
+        if not names:
+            raise InvalidRecordError("record list cannot be empty")
+
+        bad = _numpy_bad_rows(names, scores, weights)
+        if bad.any():
+            # Re-check the first failing record to raise its exact message.
+            first = int(np.argmax(bad))
+            _check_values(first, names[first], scores[first].item(), weights[first].item())
+        return cls(names, scores.astype(np.float64, copy=False), weights.astype(np.float64, copy=False))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self):
+        for name, score, weight in zip(self.names, self.scores, self.weights):
+            yield {"name": name, "score": score, "weight": weight}
+
+
+Records = Union[RecordBatch, Iterable[Mapping[str, Any]]]
+
+
+def _numpy_bad_rows(names: List[str], scores, weights):
+    # Mask of the rows _check_values rejects, for numeric NumPy columns.
+    # NaN fails every comparison, so ~(ok) flags NaN together with out-of-range.
+    bad = ~((scores >= 0) & (scores <= 100) & (weights > 0))
+    if weights.dtype.kind in "iu":
+        for i in np.flatnonzero(weights > _FLOAT_EXACT_INT):
+            if not _holds_exactly(int(weights[i])):
+                bad[i] = True
+    bad |= np.fromiter(
+        (not isinstance(n, str) or not n.strip() for n in names), dtype=bool, count=len(names)
+    )
+    return bad
+
+
+class _ExactSum:
+    """
+    Running float sum that is rounded only once, when read; it equals
+    math.fsum() over the same values. Any order of adds gives the same
+    result, so one-pass and merged totals match the list-based functions
+    exactly.
+    """
+
+    __slots__ = ("partials", "special")
+
+    def __init__(self) -> None:
+        # Non-overlapping partial sums (Shewchuk), as in math.fsum.
+        self.partials: List[float] = []
+        # inf/nan terms, which would poison the partials.
+        self.special = 0.0
+
+    def add(self, x: float) -> None:
+        if not math.isfinite(x):
+            self.special += x
+            return
+        partials = self.partials
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                partials[i] = lo
+                i += 1
+            x = hi
+        partials[i:] = [x]
+
+    def extend(self, values: Iterable[float]) -> None:
+        """Adds every value; the same result as add() for each, but summed in C."""
+        terms = values.tolist() if hasattr(values, "tolist") else list(values)
+        try:
+            part = math.fsum(terms)
+        except OverflowError:
+            part = math.inf
+        if not math.isfinite(part):
+            for x in terms:
+                self.add(x)
+            return
+        # fsum rounds the exact total once; adding the rounded part and
+        # summing again leaves the exact remainder, which shrinks by about
+        # 2**-53 each round until nothing is left (usually after one or two).
+        while part:
+            self.add(part)
+            terms.append(-part)
+            part = math.fsum(terms)
+
+    def update(self, other: "_ExactSum") -> None:
+        for x in other.partials:
+            self.add(x)
+        self.special += other.special
+
+    def value(self) -> float:
+        if self.special:
+            return self.special
+        return math.fsum(self.partials)
+
+
+def _weighted_mean(weighted_sum: float, total_weight: float) -> float:
     return round(weighted_sum / total_weight, 2)
 
 
-def top_student(records: Iterable[Mapping[str, Any]]) -> str:
-    recs = validate_records(records)
-    top = max(recs, key=lambda r: r["score"])
-    return top["name"]
+def _percentage(count: int, total: int) -> float:
+    return round((count / total) * 100, 2)
 
 
-def pass_rate(records: Iterable[Mapping[str, Any]], pass_mark: float = 50) -> float:
+def _check_pass_mark(pass_mark: Any) -> None:
     if not isinstance(pass_mark, (int, float)) or pass_mark != pass_mark:
         raise InvalidRecordError("pass_mark must be a valid number")
-    recs = validate_records(records)
-    passed = sum(1 for r in recs if r["score"] >= pass_mark)
-    return round((passed / len(recs)) * 100, 2)
 
 
-def grade_distribution(
-    records: Iterable[Mapping[str, Any]],
-    *,
-    boundaries: Optional[Mapping[str, float]] = None,
-) -> Dict[str, int]:
+class GradeScale:
     """
-    Returns counts per grade.
+    Compiled grade boundaries: the minimum score for each grade, plus the
+    grade given to scores below all of them.
 
-    Default boundaries:
-      A >= 70, B >= 60, C >= 50, F < 50
+        scale = GradeScale({"Distinction": 85, "Merit": 70, "Pass": 50}, fail="Fail")
+        scale.grade(72)                               # "Merit"
+        counts, grades = scale.classify([91, 72, 40])
 
-    You can override by passing boundaries like:
-      {"A": 80, "B": 70, "C": 60}  # F is implicit
+    Any number of grades is allowed, in any order; a score gets the grade
+    with the highest minimum it reaches, found by binary search. Pass a scale
+    as boundaries= anywhere in this module to use grades other than A-F.
     """
-    recs = validate_records(records)
 
-    if boundaries is None:
-        boundaries = {"A": 70, "B": 60, "C": 50}
+    __slots__ = ("grades", "_thresholds", "_labels", "_np_thresholds")
+
+    def __init__(self, boundaries: Mapping[str, float], fail: str = "F") -> None:
+        if not boundaries:
+            raise InvalidRecordError("boundaries must include at least one grade")
+        for g, v in boundaries.items():
+            if not isinstance(v, (int, float)) or v != v:
+                raise InvalidRecordError(f"boundary for {g} must be a valid number")
+        if fail in boundaries:
+            raise InvalidRecordError(f"boundaries must not include the fail grade {fail}")
+        ranked = sorted(boundaries.items(), key=lambda item: item[1])
+        for (low, low_v), (high, high_v) in zip(ranked, ranked[1:]):
+            if low_v == high_v:
+                raise InvalidRecordError(f"boundaries for {low} and {high} must differ")
+
+        # Ascending minimums; _labels[i] is the grade of a score reaching i of them.
+        self._thresholds = tuple(float(v) for _, v in ranked)
+        self._labels = (fail,) + tuple(g for g, _ in ranked)
+        self._np_thresholds = np.array(self._thresholds) if np is not None else None
+        # Best grade first, fail grade last; the key order of every count dict.
+        self.grades = self._labels[::-1]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GradeScale):
+            return NotImplemented
+        return self._thresholds == other._thresholds and self._labels == other._labels
+
+    def __hash__(self) -> int:
+        return hash((self._thresholds, self._labels))
+
+    def __repr__(self) -> str:
+        bounds = dict(zip(self._labels[:0:-1], self._thresholds[::-1]))
+        return f"GradeScale({bounds!r}, fail={self._labels[0]!r})"
+
+    def grade(self, score: float) -> str:
+        return self._labels[bisect_right(self._thresholds, score)]
+
+    def counts(self, scores: Iterable[float]) -> Dict[str, int]:
+        """Number of scores per grade, every grade present."""
+        values = _score_array(scores)
+        if values is not None:
+            ranks = np.searchsorted(self._np_thresholds, values, side="right")
+            tally = np.bincount(ranks, minlength=len(self._labels)).tolist()
+        else:
+            thresholds = self._thresholds
+            tally = [0] * len(self._labels)
+            for s in scores:
+                tally[bisect_right(thresholds, s)] += 1
+        return self._count_dict(tally)
+
+    def classify(self, scores: Iterable[float]) -> Tuple[Dict[str, int], List[str]]:
+        """Returns (counts(scores), the grade of each score in order)."""
+        values = _score_array(scores)
+        if values is not None:
+            ranks = np.searchsorted(self._np_thresholds, values, side="right")
+            tally = np.bincount(ranks, minlength=len(self._labels)).tolist()
+            grades = np.array(self._labels, dtype=object)[ranks].tolist()
+            return self._count_dict(tally), grades
 
+        thresholds, labels = self._thresholds, self._labels
+        tally = [0] * len(labels)
+        grades = []
+        for s in scores:
+            rank = bisect_right(thresholds, s)
+            tally[rank] += 1
+            grades.append(labels[rank])
+        return self._count_dict(tally), grades
+
+    def _count_dict(self, tally: List[int]) -> Dict[str, int]:
+        return dict(zip(self.grades, reversed(tally)))
+
+
+def _score_array(scores: Iterable[float]):
+    # scores as a float64 ndarray when NumPy is worth using for them, else None.
+    if np is None:
+        return None
+    if isinstance(scores, np.ndarray):
+        return scores.astype(np.float64, copy=False)
+    if isinstance(scores, array) and len(scores) >= _NUMPY_MIN_RECORDS:
+        return np.asarray(scores, dtype=np.float64)
+    return None
+
+
+Boundaries = Union[Mapping[str, float], GradeScale]
+
+_DEFAULT_BOUNDARIES = {"A": 70, "B": 60, "C": 50}
+
+
+def _compile_boundaries(boundaries: Mapping[str, float]) -> GradeScale:
     # Validate boundaries: must contain A,B,C at least, be numeric, and descending.
     needed = ("A", "B", "C")
     for g in needed:
@@ -110,16 +481,883 @@ def grade_distribution(
     a, b, c = float(boundaries["A"]), float(boundaries["B"]), float(boundaries["C"])
     if not (a > b > c):
         raise InvalidRecordError("boundaries must be strictly descending: A > B > C")
+    return GradeScale({"A": a, "B": b, "C": c})
+
+
+@lru_cache(maxsize=128)
+def _cached_scale(items: Tuple[Tuple[str, float], ...]) -> GradeScale:
+    return _compile_boundaries(dict(items))
+
+
+def _grade_scale(boundaries: Optional[Boundaries]) -> GradeScale:
+    """
+    The GradeScale for a boundaries= argument. A mapping keeps its original
+    meaning (A, B and C are required, other keys only need to be numbers) and
+    is compiled once per distinct content.
+    """
+    if isinstance(boundaries, GradeScale):
+        return boundaries
+    if boundaries is None:
+        boundaries = _DEFAULT_BOUNDARIES
+    try:
+        return _cached_scale(tuple(boundaries.items()))
+    except (AttributeError, TypeError):
+        # Not a mapping, or unhashable values: validate without caching.
+        return _compile_boundaries(boundaries)
+
+
+def _numpy_columns(batch: RecordBatch):
+    # (scores, weights) as float64 arrays sharing the batch's memory, or None
+    # when the batch is better served by the pure-Python loops.
+    if np is None or len(batch) < _NUMPY_MIN_RECORDS:
+        return None
+    return np.asarray(batch.scores, dtype=np.float64), np.asarray(batch.weights, dtype=np.float64)
+
+
+def _settled_mean(mean: float, n: int) -> Optional[float]:
+    # round(mean, 2) when any summation order of the n records rounds the same,
+    # else None. Every term is non-negative, so sums in any order are each
+    # within n*eps (relative) of the exact sums, and quotients of them within
+    # 4*n*eps of each other; that gap must not straddle a rounding boundary.
+    error = 4 * (n + 2) * sys.float_info.epsilon
+    if math.isfinite(mean):
+        rounded = round(mean, 2)
+        if round(mean * (1 - error), 2) == rounded == round(mean * (1 + error), 2):
+            return rounded
+    return None
+
+
+def _record_order_mean(products, weights) -> float:
+    # The rounded mean of the score*weight and weight columns (array('d') or
+    # float64 ndarrays). Sums run in record order with the builtin sum(), as
+    # weighted_average has always computed them, so the result never changes.
+    if np is not None and len(weights) >= _NUMPY_MIN_RECORDS:
+        products = np.asarray(products, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        # NumPy's pairwise sums are fast; keep their mean when it is settled.
+        fast = _settled_mean(float(products.sum()) / float(weights.sum()), len(weights))
+        if fast is not None:
+            return fast
+        products, weights = products.tolist(), weights.tolist()
+    return _weighted_mean(sum(products), sum(weights))
+
+
+def _batch_weighted_average(batch: RecordBatch) -> float:
+    columns = _numpy_columns(batch)
+    if columns is None:
+        return _record_order_mean([s * w for s, w in zip(batch.scores, batch.weights)], batch.weights)
+    scores, weights = columns
+    return _record_order_mean(scores * weights, weights)
+
+
+def _batch_top_index(batch: RecordBatch) -> int:
+    # Both argmax and max() keep the first of several equal scores.
+    columns = _numpy_columns(batch)
+    if columns is not None:
+        return int(np.argmax(columns[0]))
+    return max(range(len(batch)), key=batch.scores.__getitem__)
+
+
+def _batch_pass_count(batch: RecordBatch, pass_mark: float) -> int:
+    columns = _numpy_columns(batch)
+    if columns is not None:
+        return int(np.count_nonzero(columns[0] >= pass_mark))
+    return sum(1 for s in batch.scores if s >= pass_mark)
+
+
+def _batch_products(batch: RecordBatch):
+    # score*weight per record: a list, or a float64 ndarray for large batches.
+    columns = _numpy_columns(batch)
+    if columns is None:
+        return [s * w for s, w in zip(batch.scores, batch.weights)]
+    return columns[0] * columns[1]
+
+
+def _batch_grade_counts(batch: RecordBatch, scale: GradeScale) -> Dict[str, int]:
+    # Batch columns are array('d') or float64 ndarrays, so counts() picks NumPy
+    # for large batches by itself.
+    return scale.counts(batch.scores)
+
+
+def weighted_average(records: Records) -> float:
+    return _batch_weighted_average(RecordBatch.from_records(records))
+
+
+def top_student(records: Records) -> str:
+    batch = RecordBatch.from_records(records)
+    return batch.names[_batch_top_index(batch)]
+
+
+def pass_rate(records: Records, pass_mark: float = 50) -> float:
+    _check_pass_mark(pass_mark)
+    batch = RecordBatch.from_records(records)
+    return _percentage(_batch_pass_count(batch, pass_mark), len(batch))
+
+
+def grade_distribution(
+    records: Records,
+    *,
+    boundaries: Optional[Boundaries] = None,
+) -> Dict[str, int]:
+    """
+    Returns counts per grade.
+
+    Default boundaries:
+      A >= 70, B >= 60, C >= 50, F < 50
+
+    You can override by passing boundaries like:
+      {"A": 80, "B": 70, "C": 60}  # F is implicit
+
+    or a GradeScale for any other set of grades.
+    """
+    batch = RecordBatch.from_records(records)
+    return _batch_grade_counts(batch, _grade_scale(boundaries))
+
+
+def summarize(
+    records: Records,
+    pass_mark: float = 50,
+    boundaries: Optional[Boundaries] = None,
+    *,
+    collect_errors: bool = False,
+) -> Dict[str, Any]:
+    """
+    Returns every statistic at once:
+
+      {"count": ..., "weighted_average": ..., "top_student": ...,
+       "pass_rate": ..., "grade_distribution": {...}}
+
+    Each value is identical to what the function of the same name returns,
+    including rounding and top_student keeping the first of equal scores.
+    Records are validated and counted in a single pass that keeps only the
+    current top student and two float columns, weight and score*weight, which
+    the record-order sums of weighted_average need; names and records are not
+    kept. A RecordBatch is aggregated column-wise instead. pass_mark and
+    boundaries are checked before any record is read; collect_errors works as
+    for iter_validated.
+    """
+    _check_pass_mark(pass_mark)
+    scale = _grade_scale(boundaries)
+    if isinstance(records, RecordBatch):
+        return {
+            "count": len(records),
+            "weighted_average": _batch_weighted_average(records),
+            "top_student": records.names[_batch_top_index(records)],
+            "pass_rate": _percentage(_batch_pass_count(records, pass_mark), len(records)),
+            "grade_distribution": _batch_grade_counts(records, scale),
+        }
+
+    errors: Optional[List[InvalidRecordError]] = [] if collect_errors else None
+    count = passed = 0
+    top_name, top_score = "", -math.inf
+    thresholds = scale._thresholds
+    tally = [0] * len(thresholds) + [0]
+    weights = array("d")
+    products = array("d")
+    add_weight, add_product = weights.append, products.append
+    for _, name, score, weight in _checked_rows(records, errors):
+        count += 1
+        # Strictly greater, so the first of equal scores stays on top.
+        if score > top_score:
+            top_name, top_score = name, score
+        if score >= pass_mark:
+            passed += 1
+        tally[bisect_right(thresholds, score)] += 1
+        add_weight(weight)
+        add_product(score * weight)
+    _finish_checks(count, errors)
+    return {
+        "count": count,
+        "weighted_average": _record_order_mean(products, weights),
+        "top_student": top_name,
+        "pass_rate": _percentage(passed, count),
+        "grade_distribution": scale._count_dict(tally),
+    }
+
+
+# Records gathered per column-wise update when extending with plain records.
+_ACCUMULATE_CHUNK = 4096
+
+
+class ExamStatsAccumulator:
+    """
+    Mergeable running statistics for records that arrive in batches or shards.
+
+    Keeps exact weight and score*weight sums, the record and pass counts, the
+    current top student and the grade buckets, all in constant memory.
+    snapshot() returns what summarize() would for every record added so far,
+    in the order added; merge() folds in another accumulator as if its
+    records had been added after this one's.
+
+        daily = ExamStatsAccumulator()
+        daily.extend(monday_records)
+        daily.extend(tuesday_records)
+        daily.merge(shard_accumulator)
+        daily.snapshot()["weighted_average"]
+
+    Error messages number records by their position among all records ever
+    offered to this accumulator. When a record is invalid, the records before
+    it stay added.
+    """
+
+    def __init__(
+        self,
+        pass_mark: float = 50,
+        boundaries: Optional[Boundaries] = None,
+    ) -> None:
+        _check_pass_mark(pass_mark)
+        self.pass_mark = pass_mark
+        self._bounds = _grade_scale(boundaries)
+        self.count = 0
+        self.passed = 0
+        self.top_name = ""
+        self.top_score = -math.inf
+        self.grades = dict.fromkeys(self._bounds.grades, 0)
+        self._total_weight = _ExactSum()
+        self._weighted_sum = _ExactSum()
+        # Records offered so far, valid or not; numbers the next one.
+        self._offered = 0
+
+    def add(self, record: Mapping[str, Any]) -> None:
+        self.extend((record,))
+
+    def extend(self, records: Records, *, collect_errors: bool = False) -> None:
+        """collect_errors works as for iter_validated, raising once the
+        valid records among records have been added."""
+        errors: Optional[List[InvalidRecordError]] = [] if collect_errors else None
+        self._extend(records, errors)
+        if errors:
+            raise MultipleRecordErrors(errors)
+
+    def _extend(self, records: Records, errors: Optional[List[InvalidRecordError]]) -> None:
+        if isinstance(records, RecordBatch):
+            self._add_batch(records)
+            self._offered += len(records)
+            return
+        # Valid records are gathered into small batches, so the aggregates
+        # run column-wise; records before an invalid one are still added.
+        names: List[str] = []
+        scores = array("d")
+        weights = array("d")
+        added = failed = 0
+        try:
+            for _, name, score, weight in _checked_rows(records, errors, self._offered):
+                names.append(name)
+                scores.append(score)
+                weights.append(weight)
+                if len(names) == _ACCUMULATE_CHUNK:
+                    self._add_batch(RecordBatch(names, scores, weights))
+                    added += len(names)
+                    names, scores, weights = [], array("d"), array("d")
+        except InvalidRecordError:
+            failed = 1
+            raise
+        finally:
+            if names:
+                self._add_batch(RecordBatch(names, scores, weights))
+                added += len(names)
+            skipped = len(errors) if errors is not None else 0
+            self._offered += added + skipped + failed
+
+    def _add_batch(self, batch: RecordBatch, products=None) -> None:
+        # products, if given, is _batch_products(batch).
+        if not len(batch):
+            return
+        top = _batch_top_index(batch)
+        # Ties keep the earlier student, already held here.
+        if batch.scores[top] > self.top_score:
+            self.top_name, self.top_score = batch.names[top], float(batch.scores[top])
+        self.passed += _batch_pass_count(batch, self.pass_mark)
+        for g, n in _batch_grade_counts(batch, self._bounds).items():
+            self.grades[g] += n
+        if products is None:
+            products = _batch_products(batch)
+        self._total_weight.extend(batch.weights)
+        self._weighted_sum.extend(products)
+        self.count += len(batch)
+
+    def merge(self, other: "ExamStatsAccumulator") -> None:
+        if other.pass_mark != self.pass_mark or other._bounds != self._bounds:
+            raise InvalidRecordError("cannot merge accumulators with different pass_mark or boundaries")
+        self.count += other.count
+        self.passed += other.passed
+        self._offered += other._offered
+        # Ties keep this accumulator's student, who comes first.
+        if other.top_score > self.top_score:
+            self.top_name, self.top_score = other.top_name, other.top_score
+        for g, n in other.grades.items():
+            self.grades[g] += n
+        self._total_weight.update(other._total_weight)
+        self._weighted_sum.update(other._weighted_sum)
+
+    def snapshot(self, *, exact: bool = False) -> Dict[str, Any]:
+        """
+        Returns the summarize() dict for the records added so far.
+
+        weighted_average divides the exact sums, so it does not depend on how
+        records were split or merged. summarize() sums in record order instead;
+        the two round alike unless the mean lies within rounding error of a
+        halfway point such as 24.565. Then AmbiguousRoundingError is raised,
+        since only the records themselves could settle it, unless exact=True
+        asks for the exact-sum average regardless.
+        """
+        if self.count == 0:
+            raise InvalidRecordError("record list cannot be empty")
+        mean = self._weighted_sum.value() / self._total_weight.value()
+        exact = exact or not math.isfinite(mean)  # inf/nan sums round alike in any order
+        average = round(mean, 2) if exact else _settled_mean(mean, self.count)
+        if average is None:
+            raise AmbiguousRoundingError(
+                f"weighted average {mean!r} is too close to a rounding boundary to match summarize(); "
+                "pass exact=True for the exact-sum value"
+            )
+        return self._summary(average)
+
+    def _summary(self, weighted_average: float) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "weighted_average": weighted_average,
+            "top_student": self.top_name,
+            "pass_rate": _percentage(self.passed, self.count),
+            "grade_distribution": dict(self.grades),
+        }
+
+
+def _float_column(values) -> array:
+    # values (a list, array('d') or ndarray) as array('d'), to pickle compactly.
+    if isinstance(values, array):
+        return values
+    if np is not None and isinstance(values, np.ndarray):
+        return array("d", values.astype(np.float64, copy=False).tobytes())
+    return array("d", values)
+
+
+def _summarize_chunk(
+    records: Records,
+    start: int,
+    pass_mark: float,
+    boundaries: Optional[Boundaries],
+    collect_errors: bool,
+) -> Tuple[ExamStatsAccumulator, Optional[List[InvalidRecordError]], array, array]:
+    # Process-pool worker: aggregates one chunk, numbering its records from
+    # start. Also returns the chunk's weight and score*weight columns, for
+    # record-order sums should the merged exact mean not settle the rounding.
+    errors: Optional[List[InvalidRecordError]] = [] if collect_errors else None
+    if isinstance(records, RecordBatch):
+        batch = records
+    else:
+        names: List[str] = []
+        scores = array("d")
+        weights = array("d")
+        for _, name, score, weight in _checked_rows(records, errors, start):
+            names.append(name)
+            scores.append(score)
+            weights.append(weight)
+        batch = RecordBatch(names, scores, weights)
+    acc = ExamStatsAccumulator(pass_mark, boundaries)
+    products = _batch_products(batch)
+    acc._add_batch(batch, products)
+    acc._offered = len(batch) + (len(errors) if errors else 0)
+    return acc, errors, _float_column(batch.weights), _float_column(products)
+
+
+def _chunks(records: Records, chunk_size: int):
+    # Yields (start index, chunk) pairs without reading ahead of the pool.
+    if isinstance(records, RecordBatch):
+        for start in range(0, len(records), chunk_size):
+            end = start + chunk_size
+            yield start, RecordBatch(
+                records.names[start:end], records.scores[start:end], records.weights[start:end]
+            )
+        return
+    if records is None:
+        raise InvalidRecordError("records cannot be None")
+    try:
+        rows = iter(records)
+    except TypeError as e:
+        raise InvalidRecordError("records must be an iterable of dict-like objects") from e
+    start = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def summarize_parallel(
+    records: Records,
+    pass_mark: float = 50,
+    boundaries: Optional[Boundaries] = None,
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = 50_000,
+    collect_errors: bool = False,
+) -> Dict[str, Any]:
+    """
+    summarize() split across a process pool.
+
+    The input is cut into chunk_size records, each validated and aggregated
+    by a worker into an ExamStatsAccumulator. Partial results are merged in
+    input order, so the output and the first error raised (with its global
+    record index) are those of summarize(). weighted_average comes from the
+    exact sums when they settle its rounding (see
+    ExamStatsAccumulator.snapshot), and otherwise from record-order sums of
+    the weight and score*weight columns the workers send back; those 16
+    bytes per record are the only part of the input kept until the end. At
+    most 2 * workers chunks are in flight.
+
+    workers defaults to the CPU count; workers=1 is summarize() in-process.
+    """
+    if workers == 1:
+        return summarize(records, pass_mark, boundaries, collect_errors=collect_errors)
+    if chunk_size <= 0:
+        raise InvalidRecordError("chunk_size must be > 0")
+    total = ExamStatsAccumulator(pass_mark, boundaries)
+    workers = workers or os.cpu_count() or 1
+    errors: Optional[List[InvalidRecordError]] = [] if collect_errors else None
+    weights: List[array] = []
+    products: List[array] = []
+
+    def merge(future) -> None:
+        acc, chunk_errors, chunk_weights, chunk_products = future.result()
+        total.merge(acc)
+        weights.append(chunk_weights)
+        products.append(chunk_products)
+        if chunk_errors:
+            errors.extend(chunk_errors)
+
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for start, chunk in _chunks(records, chunk_size):
+                pending.append(pool.submit(
+                    _summarize_chunk, chunk, start, pass_mark, total._bounds, collect_errors
+                ))
+                while pending and (len(pending) >= 2 * workers or pending[0].done()):
+                    merge(pending.popleft())
+            while pending:
+                merge(pending.popleft())
+        finally:
+            for future in pending:
+                future.cancel()
+
+    _finish_checks(total.count, errors)
+    mean = total._weighted_sum.value() / total._total_weight.value()
+    average = _settled_mean(mean, total.count)
+    if average is None:
+        average = _weighted_mean(sum(chain.from_iterable(products)), sum(chain.from_iterable(weights)))
+    return total._summary(average)
+
+
+# Ranking and quantiles. Equal scores are ordered by record position, the
+# first record ranking higher, just as top_student keeps the first of equal
+# scores: top_k(records, 1)[0][0] == top_student(records).
+
+
+def _check_k(k: Any) -> None:
+    if not isinstance(k, int) or isinstance(k, bool) or k < 1:
+        raise InvalidRecordError("k must be a positive integer")
+
+
+def _check_quantile(q: Any) -> None:
+    if not isinstance(q, (int, float)) or not (0 <= q <= 1):
+        raise InvalidRecordError("quantile must be between 0 and 1")
+
+
+def top_k(records: Records, k: int) -> List[Tuple[str, float]]:
+    """
+    The k best (name, score) pairs, best first; all records if there are
+    fewer than k. Uses a k-sized heap (or a NumPy partition for large
+    batches) instead of sorting every record.
+    """
+    _check_k(k)
+    batch = RecordBatch.from_records(records)
+    columns = _numpy_columns(batch)
+    if columns is None:
+        best = nlargest(k, range(len(batch)), key=batch.scores.__getitem__)
+    else:
+        scores = columns[0]
+        n = len(scores)
+        if k >= n:
+            chosen = np.arange(n)
+        else:
+            kth = np.partition(scores, n - k)[n - k]
+            above = np.flatnonzero(scores > kth)
+            ties = np.flatnonzero(scores == kth)[: k - len(above)]
+            chosen = np.concatenate([above, ties])
+        # Highest score first, then earliest record.
+        best = chosen[np.lexsort((chosen, -scores[chosen]))].tolist()
+    return [(batch.names[i], float(batch.scores[i])) for i in best]
+
+
+def rank(records: Records, name: str) -> int:
+    """
+    1-based position of the student's first record in score order, counting
+    equal scores before it as ahead, so rank(records, top_student(records))
+    is 1 and top_k(records, k)[rank - 1] is that student for k >= rank.
+    """
+    batch = RecordBatch.from_records(records)
+    try:
+        i = batch.names.index(name)
+    except ValueError:
+        raise InvalidRecordError(f"no record for student {name!r}") from None
+    score = batch.scores[i]
+    columns = _numpy_columns(batch)
+    if columns is not None:
+        scores = columns[0]
+        return 1 + int(np.count_nonzero(scores > score)) + int(np.count_nonzero(scores[:i] == score))
+    ahead = sum(1 for s in batch.scores if s > score)
+    return 1 + ahead + sum(1 for s in batch.scores[:i] if s == score)
+
+
+def _select(values: List[float], ks: Iterable[int]) -> Dict[int, float]:
+    # The k-th smallest value (0-based) for every k in ks, by three-way
+    # quickselect: expected O(n log len(ks)), without sorting values.
+    found: Dict[int, float] = {}
+    stack = [(values, 0, sorted(set(ks)))]
+    while stack:
+        part, offset, wanted = stack.pop()
+        pivot = sorted((part[0], part[len(part) // 2], part[-1]))[1]
+        lower = [v for v in part if v < pivot]
+        upper = [v for v in part if v > pivot]
+        equal_start = offset + len(lower)
+        upper_start = offset + len(part) - len(upper)
+        low_ks = [k for k in wanted if k < equal_start]
+        high_ks = [k for k in wanted if k >= upper_start]
+        for k in wanted:
+            if equal_start <= k < upper_start:
+                found[k] = pivot
+        if low_ks:
+            stack.append((lower, offset, low_ks))
+        if high_ks:
+            stack.append((upper, upper_start, high_ks))
+    return found
+
+
+def _interpolate(n: int, q: float) -> Tuple[int, float]:
+    # Linear interpolation between order statistics, as numpy.quantile and
+    # statistics.quantiles(method="inclusive") do: (lower index, fraction).
+    h = (n - 1) * q
+    lower = min(int(h), n - 1)
+    return lower, h - lower
+
+
+def quantiles(records: Records, qs: Iterable[float]) -> List[float]:
+    """
+    Exact score quantiles, one per q in qs (0 <= q <= 1), interpolating
+    linearly between neighbouring scores: 0.5 is the median, 0.1 and 0.9
+    are P10 and P90.
+
+        p10, median, p90 = quantiles(records, (0.1, 0.5, 0.9))
+
+    The needed order statistics are found by selection (quickselect, or a
+    NumPy partition for large batches), never by sorting every score.
+    """
+    qs = list(qs)
+    for q in qs:
+        _check_quantile(q)
+    batch = RecordBatch.from_records(records)
+    n = len(batch)
+    positions = [_interpolate(n, q) for q in qs]
+    ks = {k for lower, _ in positions for k in (lower, min(lower + 1, n - 1))}
+
+    columns = _numpy_columns(batch)
+    if columns is not None:
+        kth = sorted(ks)
+        selected = dict(zip(kth, np.partition(columns[0], kth)[kth].tolist()))
+    else:
+        selected = _select(list(batch.scores), ks)
+
+    result = []
+    for lower, fraction in positions:
+        low = selected[lower]
+        high = selected[min(lower + 1, n - 1)]
+        result.append(low + (high - low) * fraction if fraction else low)
+    return result
+
+
+def quantile(records: Records, q: float) -> float:
+    return quantiles(records, (q,))[0]
+
+
+class QuantileSketch:
+    """
+    Approximate score quantiles for streams too large to keep, in constant
+    memory.
+
+    Scores are counted in bins of width resolution over 0-100, so a quantile
+    is at most resolution below the exact one, and exact when the scores are
+    multiples of resolution (whole marks with the default 0.01). Sketches
+    built with the same resolution merge exactly, e.g. one per shard.
+
+        sketch = QuantileSketch()
+        for batch in stream:
+            sketch.update(r["score"] for r in iter_validated(batch))
+        sketch.quantile(0.9)
+    """
+
+    def __init__(self, resolution: float = 0.01) -> None:
+        if not isinstance(resolution, (int, float)) or not (0 < resolution <= 100):
+            raise InvalidRecordError("resolution must be between 0 and 100")
+        self.resolution = resolution
+        self.count = 0
+        self._scale = 1 / resolution
+        self._bins = [0] * (int(100 * self._scale + 1e-9) + 1)
+
+    def add(self, score: float) -> None:
+        self.update((score,))
+
+    def update(self, scores: Iterable[float]) -> None:
+        bins, scale = self._bins, self._scale
+        last = len(bins) - 1
+        added = 0
+        try:
+            for s in scores:
+                if not isinstance(s, (int, float)) or not (0 <= s <= 100):
+                    raise InvalidRecordError("score must be between 0 and 100")
+                # The small offset keeps e.g. 0.29 / 0.01 = 28.999... in bin 29.
+                bins[min(int(s * scale + 1e-9), last)] += 1
+                added += 1
+        finally:
+            self.count += added
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.resolution != self.resolution:
+            raise InvalidRecordError("cannot merge sketches with different resolutions")
+        self._bins = [a + b for a, b in zip(self._bins, other._bins)]
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """Same interpolation as quantiles(), over the binned scores."""
+        _check_quantile(q)
+        if self.count == 0:
+            raise InvalidRecordError("record list cannot be empty")
+        lower, fraction = _interpolate(self.count, q)
+        low = self._value_at(lower)
+        if not fraction:
+            return low
+        high = self._value_at(min(lower + 1, self.count - 1))
+        return low + (high - low) * fraction
+
+    def _value_at(self, k: int) -> float:
+        # Lower edge of the bin holding the k-th smallest score (0-based).
+        seen = 0
+        for i, n in enumerate(self._bins):
+            seen += n
+            if seen > k:
+                return min(i * self.resolution, 100.0)
+        raise AssertionError("k out of range")
+
+
+# File loaders. Rows are checked as validate_records would check the same
+# records, with the same messages and 0-based record indices, while the file
+# is parsed straight into RecordBatch columns. load_records_* return one batch;
+# iter_batches_* yield batches of up to chunk_size records, for files larger
+# than memory:
+#
+#     acc = ExamStatsAccumulator()
+#     for batch in iter_batches_csv("scores.csv"):
+#         acc.extend(batch)
+
+_FIELDS = ("name", "score", "weight")
+
+_CHUNK_SIZE = 65_536
+
+
+def _row_batches(rows, chunk_size: Optional[int], collect_errors: bool) -> Iterator[RecordBatch]:
+    # rows yields (index, name, score, weight), or an InvalidRecordError for a
+    # row that cannot be read at all. chunk_size None means a single batch.
+    errors: Optional[List[InvalidRecordError]] = [] if collect_errors else None
+    count = 0
+    names: List[str] = []
+    scores = array("d")
+    weights = array("d")
+    for row in rows:
+        try:
+            if isinstance(row, InvalidRecordError):
+                raise row
+            name, score, weight = _check_values(*row)
+        except InvalidRecordError as e:
+            if errors is None:
+                raise
+            errors.append(e)
+            continue
+        names.append(name)
+        scores.append(score)
+        weights.append(weight)
+        if len(names) == chunk_size:
+            count += len(names)
+            yield RecordBatch(names, scores, weights)
+            names, scores, weights = [], array("d"), array("d")
+    if names:
+        count += len(names)
+        yield RecordBatch(names, scores, weights)
+    _finish_checks(count, errors)
+
+
+def _concat(batches: Iterable[RecordBatch]) -> RecordBatch:
+    batches = list(batches)
+    if len(batches) == 1:
+        return batches[0]
+    names = [n for b in batches for n in b.names]
+    if np is not None and isinstance(batches[0].scores, np.ndarray):
+        return RecordBatch(
+            names,
+            np.concatenate([b.scores for b in batches]),
+            np.concatenate([b.weights for b in batches]),
+        )
+    scores, weights = array("d"), array("d")
+    for b in batches:
+        scores.extend(b.scores)
+        weights.extend(b.weights)
+    return RecordBatch(names, scores, weights)
+
+
+def _csv_number(text: str) -> Any:
+    # Unparseable text is passed on so _check_values reports "must be a number".
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _csv_rows(path: str, encoding: str):
+    with open(path, newline="", encoding=encoding) as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader, [])]
+        for k in _FIELDS:
+            if k not in header:
+                raise InvalidRecordError(f"CSV header missing required field: {k}")
+        columns = [header.index(k) for k in _FIELDS]
+        n, s, w = columns
+        width = max(columns) + 1
+        number = _csv_number
+        for i, row in enumerate(row for row in reader if row):
+            if len(row) < width:
+                missing = next(k for k, c in zip(_FIELDS, columns) if c >= len(row))
+                yield InvalidRecordError(f"record {i} missing required field: {missing}")
+                continue
+            yield i, row[n], number(row[s]), number(row[w])
+
+
+def _jsonl_rows(path: str, encoding: str):
+    with open(path, encoding=encoding) as f:
+        for i, line in enumerate(line for line in f if line.strip()):
+            try:
+                r = json.loads(line)
+            except ValueError:
+                yield InvalidRecordError(f"record {i} is not valid JSON")
+                continue
+            if not isinstance(r, dict):
+                yield InvalidRecordError(f"record {i} must be a JSON object")
+                continue
+            missing = [k for k in _FIELDS if k not in r]
+            if missing:
+                yield InvalidRecordError(f"record {i} missing required field: {missing[0]}")
+                continue
+            yield i, r["name"], r["score"], r["weight"]
+
+
+def iter_batches_csv(
+    path: str,
+    *,
+    chunk_size: int = _CHUNK_SIZE,
+    collect_errors: bool = False,
+    encoding: str = "utf-8",
+) -> Iterator[RecordBatch]:
+    """
+    Reads a CSV file whose header row names (at least) the name, score and
+    weight columns, in any order. Blank lines are skipped and do not count as
+    records.
+    """
+    return _row_batches(_csv_rows(path, encoding), chunk_size, collect_errors)
+
+
+def load_records_csv(path: str, *, collect_errors: bool = False, encoding: str = "utf-8") -> RecordBatch:
+    return _concat(_row_batches(_csv_rows(path, encoding), None, collect_errors))
+
+
+def iter_batches_jsonl(
+    path: str,
+    *,
+    chunk_size: int = _CHUNK_SIZE,
+    collect_errors: bool = False,
+    encoding: str = "utf-8",
+) -> Iterator[RecordBatch]:
+    """Reads one JSON object per line; blank lines are skipped."""
+    return _row_batches(_jsonl_rows(path, encoding), chunk_size, collect_errors)
+
+
+def load_records_jsonl(path: str, *, collect_errors: bool = False, encoding: str = "utf-8") -> RecordBatch:
+    return _concat(_row_batches(_jsonl_rows(path, encoding), None, collect_errors))
+
+
+def iter_batches_parquet(
+    path: str,
+    *,
+    chunk_size: int = _CHUNK_SIZE,
+    collect_errors: bool = False,
+) -> Iterator[RecordBatch]:
+    """
+    Reads the name, score and weight columns of a Parquet file (needs
+    pyarrow) chunk_size rows at a time. Numeric columns are checked with
+    whole-column NumPy operations and kept as float64 arrays.
+    """
+    if pq is None:
+        raise ImportError("reading Parquet files needs pyarrow installed")
+    parquet = pq.ParquetFile(path)
+    for k in _FIELDS:
+        if k not in parquet.schema_arrow.names:
+            raise InvalidRecordError(f"Parquet file missing required field: {k}")
+    return _parquet_batches(parquet, chunk_size, collect_errors)
+
+
+def load_records_parquet(path: str, *, collect_errors: bool = False) -> RecordBatch:
+    return _concat(iter_batches_parquet(path, collect_errors=collect_errors))
+
 
-    dist = {"A": 0, "B": 0, "C": 0, "F": 0}
-    for r in recs:
-        s = r["score"]
-        if s >= a:
-            dist["A"] += 1
-        elif s >= b:
-            dist["B"] += 1
-        elif s >= c:
-            dist["C"] += 1
+def _parquet_batches(parquet, chunk_size: int, collect_errors: bool) -> Iterator[RecordBatch]:
+    errors: Optional[List[InvalidRecordError]] = [] if collect_errors else None
+    start = count = 0
+    for chunk in parquet.iter_batches(batch_size=chunk_size, columns=list(_FIELDS)):
+        names = chunk.column(0).to_pylist()
+        scores = chunk.column(1).to_numpy(zero_copy_only=False)
+        weights = chunk.column(2).to_numpy(zero_copy_only=False)
+        if scores.dtype.kind in "biuf" and weights.dtype.kind in "biuf":
+            bad = _numpy_bad_rows(names, scores, weights)
+            if bad.any():
+                for i in np.flatnonzero(bad).tolist():
+                    try:
+                        _check_values(start + i, names[i], scores[i].item(), weights[i].item())
+                    except InvalidRecordError as e:
+                        if errors is None:
+                            raise
+                        errors.append(e)
+                keep = ~bad
+                names = list(compress(names, keep.tolist()))
+                scores, weights = scores[keep], weights[keep]
+            batch = RecordBatch(
+                names, scores.astype(np.float64, copy=False), weights.astype(np.float64, copy=False)
+            )
         else:
-            dist["F"] += 1
-    return dist
+            # Strings and other non-numeric columns: check row by row.
+            kept: List[Tuple[str, float, float]] = []
+            rows = zip(names, scores.tolist(), weights.tolist())
+            for i, (name, score, weight) in enumerate(rows, start):
+                try:
+                    kept.append(_check_values(i, name, score, weight))
+                except InvalidRecordError as e:
+                    if errors is None:
+                        raise
+                    errors.append(e)
+            batch = RecordBatch(
+                [name for name, _, _ in kept],
+                np.array([score for _, score, _ in kept], dtype=np.float64),
+                np.array([weight for _, _, weight in kept], dtype=np.float64),
+            )
+        start += len(chunk)
+        if len(batch):
+            count += len(batch)
+            yield batch
+    _finish_checks(count, errors)
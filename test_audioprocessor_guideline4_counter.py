@@ -1,6 +1,25 @@
+import array
 import math
+import audioprocessor_guideline4_counter
+import random
+import wave
 import pytest
-from audioprocessor_guideline4_counter import AudioProcessor
+from audioprocessor_guideline4_counter import (
+    NUMPY_ATOL,
+    NUMPY_RTOL,
+    AudioFeatures,
+    FEATURE_NAMES,
+    AudioProcessor,
+    PcmSamples,
+    StreamingAudioProcessor,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+requires_numpy = pytest.mark.skipif(np is None, reason="NumPy is not installed")
 
 
 class TestNormalize:
@@ -144,6 +163,32 @@ class TestSpectralCentroidBin:
         result = ap.spectral_centroid_bin(n_bins=8)
         assert result < 0.2
 
+    @staticmethod
+    def direct_dft_centroid(samples, n_bins):
+        magnitudes = []
+        for k in range(n_bins):
+            re = sum(s * math.cos(math.pi * k * i / n_bins) for i, s in enumerate(samples))
+            im = sum(s * math.sin(math.pi * k * i / n_bins) for i, s in enumerate(samples))
+            magnitudes.append(math.hypot(re, im))
+        total = sum(magnitudes)
+        if n_bins < 2 or total == 0.0:
+            return 0.0
+        return sum(k * m for k, m in enumerate(magnitudes)) / total / (n_bins - 1)
+
+    @pytest.mark.parametrize("n_bins", [1, 2, 5, 8, 12, 64])
+    @pytest.mark.parametrize("length", [3, 16, 100, 257])
+    def test_matches_direct_dft(self, n_bins, length):
+        samples = [random.Random(length).uniform(-1.0, 1.0) for _ in range(length)]
+        expected = self.direct_dft_centroid(samples, n_bins)
+        assert AudioProcessor(samples).spectral_centroid_bin(n_bins) == pytest.approx(expected, abs=1e-9)
+
+    @pytest.mark.parametrize("n_bins", [5, 8])
+    def test_pure_python_fft_fallback(self, monkeypatch, n_bins):
+        samples = [random.Random(n_bins).uniform(-1.0, 1.0) for _ in range(100)]
+        monkeypatch.setattr(audioprocessor_guideline4_counter, "np", None)
+        result = AudioProcessor(samples).spectral_centroid_bin(n_bins)
+        assert result == pytest.approx(self.direct_dft_centroid(samples, n_bins), abs=1e-9)
+
 
 class TestSilenceRatio:
     def test_empty_samples(self):
@@ -170,4 +215,297 @@ class TestSilenceRatio:
     def test_output_range(self):
         ap = AudioProcessor([0.05, -0.02, 0.5, 0.001])
         result = ap.silence_ratio()
-        assert 0.0 <= result <= 1.0
\ No newline at end of file
+        assert 0.0 <= result <= 1.0
+
+
+class TestAnalyze:
+    SIGNALS = [
+        [],
+        [0.0, 0.0, 0.0],
+        [0.5],
+        [1.0] * 16,
+        [0.5, -0.3, 0.8, -0.1, 0.4, -0.6, 0.2, -0.9],
+        [0.5, 0.005, -0.3, 0.001],
+        [1.5, -2.0, 0.8],
+    ]
+
+    def test_returns_features(self):
+        assert isinstance(AudioProcessor([0.1, -0.2]).analyze(), AudioFeatures)
+
+    @pytest.mark.parametrize("samples", SIGNALS)
+    def test_matches_individual_methods(self, samples):
+        ap = AudioProcessor(samples)
+        features = ap.analyze(n_bins=8, threshold=0.01)
+        assert features == AudioFeatures(
+            normalize=ap.normalize(),
+            compute_rms=ap.compute_rms(),
+            compute_decibels=ap.compute_decibels(),
+            zero_crossing_rate=ap.zero_crossing_rate(),
+            spectral_centroid_bin=ap.spectral_centroid_bin(n_bins=8),
+            silence_ratio=ap.silence_ratio(threshold=0.01),
+        )
+
+    def test_zero_bins(self):
+        assert AudioProcessor([0.5, 0.3]).analyze(n_bins=0).spectral_centroid_bin == 0.0
+
+
+@requires_numpy
+class TestNumpyBackend:
+    SIGNALS = TestAnalyze.SIGNALS + [
+        [random.Random(seed).uniform(-1.0, 1.0) for _ in range(70_000)] for seed in (1, 2)
+    ]
+
+    @pytest.mark.parametrize("samples", SIGNALS)
+    def test_agrees_with_python_backend(self, samples):
+        fast = AudioProcessor(samples, backend="numpy").analyze(n_bins=8)
+        slow = AudioProcessor(samples, backend="python").analyze(n_bins=8)
+        for field, expected in vars(slow).items():
+            assert getattr(fast, field) == pytest.approx(expected, rel=NUMPY_RTOL, abs=NUMPY_ATOL)
+
+    @pytest.mark.parametrize("samples", SIGNALS[:-2])
+    def test_methods_match_analyze(self, samples):
+        ap = AudioProcessor(samples, backend="numpy")
+        features = ap.analyze(n_bins=8)
+        assert features.normalize == ap.normalize()
+        assert features.compute_rms == ap.compute_rms()
+        assert features.compute_decibels == ap.compute_decibels()
+        assert features.zero_crossing_rate == ap.zero_crossing_rate()
+        assert features.spectral_centroid_bin == ap.spectral_centroid_bin(n_bins=8)
+        assert features.silence_ratio == ap.silence_ratio()
+
+    @pytest.mark.parametrize("typecode", ["f", "d"])
+    def test_buffers_are_not_copied(self, typecode):
+        buf = array.array(typecode, [0.5, -0.25, 0.0])
+        for samples in (buf, memoryview(buf), np.asarray(buf)):
+            ap = AudioProcessor(samples)
+            assert ap.backend == "numpy"
+            assert np.shares_memory(ap.samples, np.asarray(buf))
+
+    def test_float32_storage(self):
+        ap = AudioProcessor([0.5, -0.5, 0.25], backend="numpy", dtype="float32")
+        assert ap.samples.dtype == np.float32
+        assert ap.compute_rms() == pytest.approx(AudioProcessor([0.5, -0.5, 0.25]).compute_rms())
+
+    def test_lists_default_to_python(self):
+        assert AudioProcessor([0.1, 0.2]).backend == "python"
+
+    def test_with_backend(self):
+        ap = AudioProcessor(np.array([0.5, -0.5]))
+        assert ap.with_backend("python").samples == [0.5, -0.5]
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            AudioProcessor([0.1], backend="cuda")
+
+    def test_rejects_multichannel_arrays(self):
+        with pytest.raises(ValueError):
+            AudioProcessor(np.zeros((4, 2)), backend="numpy")
+
+
+class TestStreamingAudioProcessor:
+    SAMPLES = [random.Random(7).uniform(-1.0, 1.0) * (i % 5) / 4 for i in range(1000)]
+
+    def test_empty_matches_batch(self):
+        assert StreamingAudioProcessor(n_bins=8).analyze() == AudioProcessor([]).analyze(n_bins=8)
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 64, 1000])
+    def test_identical_to_batch(self, chunk_size):
+        stream = StreamingAudioProcessor(threshold=0.05, n_bins=8)
+        for start in range(0, len(self.SAMPLES), chunk_size):
+            stream.push(self.SAMPLES[start:start + chunk_size])
+        assert stream.n == len(self.SAMPLES)
+        assert stream.analyze() == AudioProcessor(self.SAMPLES).analyze(n_bins=8, threshold=0.05)
+
+    def test_metrics_track_pushed_prefix(self):
+        stream = StreamingAudioProcessor()
+        stream.push([0.5, -0.5])
+        assert stream.zero_crossing_rate() == pytest.approx(1.0)
+        stream.push([-0.5, 0.001])
+        ap = AudioProcessor([0.5, -0.5, -0.5, 0.001])
+        assert stream.zero_crossing_rate() == ap.zero_crossing_rate()
+        assert stream.compute_rms() == ap.compute_rms()
+        assert stream.silence_ratio() == ap.silence_ratio()
+        assert stream.normalize() == ap.normalize()
+
+    def test_default_bins_match_batch(self):
+        stream = StreamingAudioProcessor()
+        stream.push(self.SAMPLES)
+        assert stream.spectral_centroid_bin() == AudioProcessor(self.SAMPLES).spectral_centroid_bin()
+
+    def test_zero_bins_stops_tracking_spectrum(self):
+        stream = StreamingAudioProcessor(n_bins=0)
+        stream.push([0.5, -0.5])
+        assert stream.spectral_centroid_bin() == 0.0
+
+    @requires_numpy
+    def test_accepts_ndarray_chunks(self):
+        stream = StreamingAudioProcessor(n_bins=8)
+        stream.push(np.asarray(self.SAMPLES, dtype=np.float64))
+        assert stream.analyze() == AudioProcessor(self.SAMPLES).analyze(n_bins=8)
+
+
+class TestFrames:
+    SAMPLES = [
+        0.0 if 300 <= i < 700 else random.Random(i).uniform(-1.0, 1.0) * (i % 7) / 6
+        for i in range(1500)
+    ]
+
+    def assert_frames_match(self, ap, frame_length, hop_length):
+        framed = ap.frames(frame_length, hop_length, n_bins=8, threshold=0.05)
+        n = len(ap.samples)
+        starts = range(0, n - frame_length + 1, hop_length)
+        assert len(framed) == len(starts)
+        for row, start in enumerate(starts):
+            expected = AudioProcessor(list(ap.samples[start:start + frame_length])).analyze(
+                n_bins=8, threshold=0.05
+            )
+            assert framed.normalize[row] == expected.normalize
+            assert framed.zero_crossing_rate[row] == expected.zero_crossing_rate
+            assert framed.silence_ratio[row] == expected.silence_ratio
+            for name in ("compute_rms", "compute_decibels", "spectral_centroid_bin"):
+                assert getattr(framed, name)[row] == pytest.approx(
+                    getattr(expected, name), rel=NUMPY_RTOL, abs=NUMPY_ATOL
+                )
+
+    @pytest.mark.parametrize("frame_length, hop_length", [(256, 64), (100, 30), (64, 100), (1, 1)])
+    def test_python_matches_per_frame(self, frame_length, hop_length):
+        self.assert_frames_match(AudioProcessor(self.SAMPLES), frame_length, hop_length)
+
+    @requires_numpy
+    @pytest.mark.parametrize("frame_length, hop_length", [(256, 64), (100, 30), (64, 100), (1, 1)])
+    def test_numpy_matches_per_frame(self, frame_length, hop_length):
+        self.assert_frames_match(AudioProcessor(self.SAMPLES, backend="numpy"), frame_length, hop_length)
+
+    @pytest.mark.parametrize("backend", ["python", pytest.param("numpy", marks=requires_numpy)])
+    def test_small_batches_match_per_frame(self, monkeypatch, backend):
+        # Four frames per batch, so frames straddle several batches.
+        monkeypatch.setattr(audioprocessor_guideline4_counter, "_NP_BLOCK", 16)
+        self.assert_frames_match(AudioProcessor(self.SAMPLES, backend=backend), 100, 3)
+
+    @pytest.mark.parametrize("backend", ["python", pytest.param("numpy", marks=requires_numpy)])
+    def test_quiet_frames_after_loud_ones(self, backend):
+        # One batch spans the loud noise and the quiet tail.
+        rng = random.Random(4)
+        samples = [rng.uniform(-1.0, 1.0) for _ in range(200_000)]
+        samples += [3e-4 * rng.uniform(-1.0, 1.0) for _ in range(8192)]
+        framed = AudioProcessor(samples, backend=backend).frames(2048, 512, n_bins=8)
+        for row in range(len(framed) - 8, len(framed)):
+            start = row * 512
+            expected = AudioProcessor(samples[start:start + 2048]).analyze(n_bins=8)
+            for name in ("compute_rms", "compute_decibels"):
+                assert getattr(framed, name)[row] == pytest.approx(
+                    getattr(expected, name), rel=NUMPY_RTOL, abs=NUMPY_ATOL
+                )
+
+    def test_signal_shorter_than_frame(self):
+        assert len(AudioProcessor([0.1] * 10).frames(frame_length=16)) == 0
+
+    def test_invalid_hop(self):
+        with pytest.raises(ValueError):
+            AudioProcessor([0.1] * 10).frames(frame_length=4, hop_length=0)
+
+    @requires_numpy
+    def test_matrix(self):
+        framed = AudioProcessor(self.SAMPLES, backend="numpy").frames(256, 128, n_bins=8)
+        matrix = framed.matrix()
+        assert matrix.shape == (len(framed), len(FEATURE_NAMES))
+        assert list(matrix[:, 1]) == list(framed.compute_rms)
+
+
+class TestFileLoaders:
+    # Interleaved stereo int16 frames: left is a ramp, right its negation.
+    LEFT = [(i * 997) % 65536 - 32768 for i in range(5000)]
+    RIGHT = [-v if v > -32768 else 32767 for v in LEFT]
+
+    def write_wav(self, path, channels=2):
+        if channels == 1:
+            frames = array.array("h", self.LEFT)
+        else:
+            frames = array.array("h", [v for pair in zip(self.LEFT, self.RIGHT) for v in pair])
+        with wave.open(str(path), "wb") as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(2)
+            wav.setframerate(8000)
+            wav.writeframes(frames.tobytes())
+        return path
+
+    def expected(self, channel=None):
+        if channel == 0:
+            return [v / 32768 for v in self.LEFT]
+        if channel == 1:
+            return [v / 32768 for v in self.RIGHT]
+        return [(a + b) / 2 / 32768 for a, b in zip(self.LEFT, self.RIGHT)]
+
+    @pytest.mark.parametrize("backend", ["python", pytest.param("numpy", marks=requires_numpy)])
+    @pytest.mark.parametrize("channel", [0, 1, None])
+    def test_wav_matches_decoded_samples(self, tmp_path, backend, channel):
+        ap = AudioProcessor.from_wav(self.write_wav(tmp_path / "a.wav"), channel=channel, backend=backend)
+        expected = self.expected(channel)
+        assert isinstance(ap.samples, PcmSamples)
+        assert ap.samples.sample_rate == 8000
+        assert len(ap.samples) == len(expected)
+        assert list(ap.samples) == pytest.approx(expected)
+        features = ap.analyze(n_bins=8)
+        reference = AudioProcessor(expected).analyze(n_bins=8)
+        for field, value in vars(reference).items():
+            assert getattr(features, field) == pytest.approx(value, rel=NUMPY_RTOL, abs=NUMPY_ATOL)
+
+    def test_mono_wav(self, tmp_path):
+        ap = AudioProcessor.from_wav(self.write_wav(tmp_path / "m.wav", channels=1))
+        assert ap.normalize() == pytest.approx(1.0)
+        assert ap.samples[1] == pytest.approx(self.LEFT[1] / 32768)
+
+    @pytest.mark.parametrize("typecode, dtype", [("f", "float32"), ("d", "float64")])
+    def test_raw_float(self, tmp_path, typecode, dtype):
+        samples = [0.5, -0.25, 0.0, 0.75]
+        path = tmp_path / "a.raw"
+        path.write_bytes(array.array(typecode, samples).tobytes())
+        ap = AudioProcessor.from_raw(path, dtype=dtype)
+        assert list(ap.samples) == samples
+        assert ap.compute_rms() == pytest.approx(AudioProcessor(samples).compute_rms())
+
+    def test_raw_empty_file(self, tmp_path):
+        path = tmp_path / "empty.raw"
+        path.write_bytes(b"")
+        ap = AudioProcessor.from_raw(path)
+        assert ap.normalize() == 0.0
+        assert ap.silence_ratio() == 1.0
+
+    def test_unknown_dtype(self, tmp_path):
+        path = tmp_path / "a.raw"
+        path.write_bytes(b"\0\0")
+        with pytest.raises(ValueError):
+            AudioProcessor.from_raw(path, dtype="int24")
+
+    @requires_numpy
+    def test_wav_is_not_copied(self, tmp_path):
+        ap = AudioProcessor.from_wav(self.write_wav(tmp_path / "a.wav"), channel=0)
+        assert ap.backend == "numpy"
+        assert not ap.samples._frames.flags.owndata
+
+
+class TestAnalyzeMany:
+    CLIPS = [[random.Random(seed).uniform(-1.0, 1.0) for _ in range(seed * 37)] for seed in range(12)]
+
+    def expected(self):
+        return [AudioProcessor(clip).analyze(n_bins=8) for clip in self.CLIPS]
+
+    def test_process_pool_preserves_order(self):
+        results = AudioProcessor.analyze_many(self.CLIPS, workers=2, n_bins=8, backend="python")
+        assert list(results) == self.expected()
+
+    def test_serial(self):
+        results = AudioProcessor.analyze_many(iter(self.CLIPS), workers=1, n_bins=8)
+        assert list(results) == self.expected()
+
+    @requires_numpy
+    def test_numpy_clips(self):
+        clips = (np.asarray(clip, dtype=np.float32) for clip in self.CLIPS)
+        for features, expected in zip(AudioProcessor.analyze_many(clips, workers=2, n_bins=8), self.expected()):
+            assert features.normalize == pytest.approx(expected.normalize, rel=1e-6)
+            assert features.compute_rms == pytest.approx(expected.compute_rms, rel=1e-6)
+
+    def test_stopping_early(self):
+        results = AudioProcessor.analyze_many(self.CLIPS, workers=2, n_bins=8)
+        assert next(results) == self.expected()[0]
+        results.close()
@@ -0,0 +1,670 @@
+import json
+import math
+import os
+import pickle
+import random
+import sys
+from array import array
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "misc", "src"))
+
+import library as examlib  # noqa: E402
+from library import (  # noqa: E402
+    AmbiguousRoundingError,
+    ExamStatsAccumulator,
+    GradeScale,
+    InvalidRecordError,
+    MultipleRecordErrors,
+    QuantileSketch,
+    RecordBatch,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+requires_numpy = pytest.mark.skipif(np is None, reason="NumPy is not installed")
+requires_pyarrow = pytest.mark.skipif(examlib.pq is None, reason="pyarrow is not installed")
+
+EXAMPLE = [
+    {"name": "Alice", "score": 78, "weight": 1.0},
+    {"name": "Bob", "score": 45, "weight": 0.5},
+    {"name": "Charlie", "score": 88, "weight": 1.5},
+    {"name": "Diana", "score": 60, "weight": 1.0},
+    {"name": "Eve", "score": 52, "weight": 1.0},
+]
+
+# Record-order sums give 24.564999..., exact sums 24.565.
+HALFWAY = [
+    {"name": "s0", "score": 7, "weight": 1},
+    {"name": "s1", "score": 51.29, "weight": 0.5},
+    {"name": "s2", "score": 20, "weight": 1},
+    {"name": "s3", "score": 30.41, "weight": 1.5},
+]
+
+INVALID = [
+    {"score": 50, "weight": 1},
+    {"name": "a", "weight": 1},
+    {"name": "a", "score": 50},
+    {"name": "", "score": 50, "weight": 1},
+    {"name": "  ", "score": 50, "weight": 1},
+    {"name": 3, "score": 50, "weight": 1},
+    {"name": "a", "score": "50", "weight": 1},
+    {"name": "a", "score": float("nan"), "weight": 1},
+    {"name": "a", "score": -0.5, "weight": 1},
+    {"name": "a", "score": 100.5, "weight": 1},
+    {"name": "a", "score": 50, "weight": None},
+    {"name": "a", "score": 50, "weight": float("nan")},
+    {"name": "a", "score": 50, "weight": 0},
+    {"name": "a", "score": 50, "weight": -1},
+    {"name": "a", "score": 50, "weight": 10**400},
+    {"name": "a", "score": 50, "weight": 2**53 + 1},
+]
+
+
+def cohort(n, seed=0, ties=False):
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"student{i}",
+            "score": rng.choice((50, 60, 70, 100)) if ties else round(rng.uniform(0, 100), 2),
+            "weight": rng.choice((0.5, 1, 1.5, 2.0, 0.1)),
+        }
+        for i in range(n)
+    ]
+
+
+def individually(records, pass_mark=50, boundaries=None):
+    return {
+        "count": len(records),
+        "weighted_average": examlib.weighted_average(records),
+        "top_student": examlib.top_student(records),
+        "pass_rate": examlib.pass_rate(records, pass_mark),
+        "grade_distribution": examlib.grade_distribution(records, boundaries=boundaries),
+    }
+
+
+def error_of(call):
+    with pytest.raises(InvalidRecordError) as e:
+        call()
+    return str(e.value)
+
+
+class TestRecordBatch:
+    def test_from_records(self):
+        batch = RecordBatch.from_records(EXAMPLE)
+        assert batch.names == [r["name"] for r in EXAMPLE]
+        assert list(batch.scores) == [r["score"] for r in EXAMPLE]
+        assert list(batch.weights) == [r["weight"] for r in EXAMPLE]
+        assert list(batch) == [{**r, "score": float(r["score"])} for r in EXAMPLE]
+
+    def test_batch_is_not_rebuilt(self):
+        batch = RecordBatch.from_records(EXAMPLE)
+        assert RecordBatch.from_records(batch) is batch
+
+    @pytest.mark.parametrize("bad", INVALID)
+    @pytest.mark.parametrize("position", [0, 3])
+    def test_errors_match_validate_records(self, bad, position):
+        records = EXAMPLE[:position] + [bad] + EXAMPLE[position:]
+        expected = error_of(lambda: examlib.validate_records(records))
+        assert f"record {position} " in expected
+        assert error_of(lambda: RecordBatch.from_records(records)) == expected
+
+    @pytest.mark.parametrize("bad", [r for r in INVALID if len(r) == 3])
+    def test_from_columns_errors_match_validate_records(self, bad):
+        records = EXAMPLE[:2] + [bad] + EXAMPLE[2:]
+        columns = ([r["name"] for r in records], [r["score"] for r in records], [r["weight"] for r in records])
+        expected = error_of(lambda: examlib.validate_records(records))
+        assert error_of(lambda: RecordBatch.from_columns(*columns)) == expected
+
+    @requires_numpy
+    @pytest.mark.parametrize("position", [0, 300, 599])
+    def test_numpy_columns_report_first_bad_record(self, position):
+        records = cohort(600)
+        records[position] = {"name": "x", "score": float("nan"), "weight": 1.0}
+        records[-1 if position != 599 else 0]["weight"] = -1.0
+        names = [r["name"] for r in records]
+        scores = np.array([r["score"] for r in records])
+        weights = np.array([r["weight"] for r in records], dtype=np.float64)
+        expected = error_of(lambda: examlib.validate_records(records))
+        assert error_of(lambda: RecordBatch.from_columns(names, scores, weights)) == expected
+
+    @requires_numpy
+    def test_numpy_integer_weights_must_convert_exactly(self):
+        names = [f"s{i}" for i in range(300)]
+        scores = np.full(300, 50)
+        weights = np.ones(300, dtype=np.int64)
+        weights[7] = 2**60  # a float holds this one exactly
+        assert RecordBatch.from_columns(names, scores, weights).weights[7] == 2**60
+        weights[9] = 2**53 + 1
+        with pytest.raises(InvalidRecordError, match="record 9 weight is too large an integer"):
+            RecordBatch.from_columns(names, scores, weights)
+
+    def test_from_columns_lengths(self):
+        with pytest.raises(InvalidRecordError, match="same length"):
+            RecordBatch.from_columns(["a", "b"], [1.0], [1.0, 2.0])
+
+    @pytest.mark.parametrize("records", [None, [], 5, [1, 2]])
+    def test_invalid_containers(self, records):
+        assert error_of(lambda: RecordBatch.from_records(records)) == error_of(
+            lambda: examlib.validate_records(records)
+        )
+
+
+class TestSummarize:
+    @pytest.mark.parametrize(
+        "records", [EXAMPLE, HALFWAY, cohort(50), cohort(50, ties=True), cohort(1000, seed=3)]
+    )
+    def test_matches_individual_functions(self, records):
+        expected = individually(records)
+        assert examlib.summarize(records) == expected
+        assert examlib.summarize(iter(records)) == expected
+        assert examlib.summarize(RecordBatch.from_records(records)) == expected
+
+    def test_example(self):
+        assert examlib.summarize(EXAMPLE) == {
+            "count": 5,
+            "weighted_average": 68.9,
+            "top_student": "Charlie",
+            "pass_rate": 80.0,
+            "grade_distribution": {"A": 2, "B": 1, "C": 1, "F": 1},
+        }
+
+    def test_record_order_rounding(self):
+        assert examlib.weighted_average(HALFWAY) == 24.56
+        assert examlib.summarize(HALFWAY)["weighted_average"] == 24.56
+
+    def test_first_of_equal_scores_is_top(self):
+        records = [{"name": n, "score": 90, "weight": 1} for n in ("x", "y", "z")]
+        assert examlib.summarize(records)["top_student"] == "x"
+
+    @pytest.mark.parametrize("n", [5, 600])
+    def test_records_are_not_buffered_into_a_batch(self, monkeypatch, n):
+        records = cohort(n, seed=7)
+        expected = individually(records, 60)
+        monkeypatch.setattr(RecordBatch, "from_records", None)
+        assert examlib.summarize(iter(records), 60) == expected
+
+    def test_pass_mark_and_boundaries(self):
+        records = cohort(200, seed=5)
+        boundaries = {"A": 80, "B": 65, "C": 40}
+        assert examlib.summarize(records, 40, boundaries) == individually(records, 40, boundaries)
+
+    def test_arguments_checked_before_records(self):
+        def records():
+            raise AssertionError("records were read")
+            yield
+
+        with pytest.raises(InvalidRecordError, match="pass_mark"):
+            examlib.summarize(records(), pass_mark=float("nan"))
+        with pytest.raises(InvalidRecordError, match="descending"):
+            examlib.summarize(records(), boundaries={"A": 50, "B": 60, "C": 70})
+
+
+class TestStreamingValidation:
+    def test_iter_validated_is_lazy(self):
+        seen = []
+
+        def records():
+            for r in EXAMPLE:
+                seen.append(r["name"])
+                yield r
+
+        rows = examlib.iter_validated(records())
+        assert next(rows) == EXAMPLE[0]
+        assert seen == ["Alice"]
+
+    def test_yields_copies(self):
+        rows = list(examlib.iter_validated(EXAMPLE))
+        assert rows == EXAMPLE
+        assert all(a is not b for a, b in zip(rows, EXAMPLE))
+
+    def test_first_error_raises(self):
+        records = EXAMPLE + [INVALID[0]] + [INVALID[3]]
+        with pytest.raises(InvalidRecordError, match="record 5 missing required field: name"):
+            list(examlib.iter_validated(records))
+
+    def test_collect_errors(self):
+        records = [INVALID[0]] + EXAMPLE + [INVALID[3]]
+        rows = []
+        with pytest.raises(MultipleRecordErrors) as e:
+            for r in examlib.iter_validated(records, collect_errors=True):
+                rows.append(r)
+        assert rows == EXAMPLE
+        assert [str(err) for err in e.value.errors] == [
+            "record 0 missing required field: name",
+            "record 6 name must be a non-empty string",
+        ]
+        assert str(e.value).startswith("2 invalid record(s): ")
+
+    def test_collected_errors_pickle(self):
+        error = MultipleRecordErrors([InvalidRecordError("record 1 score must be a number")])
+        copy = pickle.loads(pickle.dumps(error))
+        assert str(copy) == str(error)
+        assert [str(e) for e in copy.errors] == ["record 1 score must be a number"]
+
+    def test_collect_errors_in_summarize_and_batches(self):
+        records = EXAMPLE + [INVALID[7]]
+        for call in (examlib.summarize, RecordBatch.from_records, examlib.validate_records):
+            with pytest.raises(MultipleRecordErrors, match="record 5 score cannot be NaN"):
+                call(records, collect_errors=True)
+
+    def test_empty_after_collecting(self):
+        with pytest.raises(InvalidRecordError, match="cannot be empty"):
+            examlib.validate_records([], collect_errors=True)
+
+
+class TestNumpyPath:
+    SIZES = [examlib._NUMPY_MIN_RECORDS, 1000, 5000]
+
+    def pure(self, monkeypatch, call):
+        with monkeypatch.context() as m:
+            m.setattr(examlib, "np", None)
+            return call()
+
+    @requires_numpy
+    @pytest.mark.parametrize("n", SIZES)
+    @pytest.mark.parametrize("ties", [False, True])
+    def test_statistics_agree(self, monkeypatch, n, ties):
+        batch = RecordBatch.from_records(cohort(n, seed=n, ties=ties))
+        assert examlib._numpy_columns(batch) is not None
+        for call in (
+            lambda: examlib.summarize(batch),
+            lambda: examlib.summarize(batch, 65, {"A": 90, "B": 80, "C": 65}),
+            lambda: examlib.top_k(batch, 10),
+            lambda: examlib.rank(batch, "student7"),
+            lambda: examlib.quantiles(batch, (0, 0.1, 0.5, 0.9, 1)),
+        ):
+            assert call() == self.pure(monkeypatch, call)
+
+    @requires_numpy
+    def test_weighted_average_matches_record_order_sum(self):
+        for seed in range(200):
+            records = cohort(examlib._NUMPY_MIN_RECORDS + seed, seed=seed)
+            total = sum(r["score"] * r["weight"] for r in records) / sum(r["weight"] for r in records)
+            assert examlib.weighted_average(records) == round(total, 2)
+
+    @requires_numpy
+    def test_grade_scale_agrees(self, monkeypatch):
+        scale = GradeScale({"A": 70, "B": 60, "C": 50})
+        scores = array("d", (r["score"] for r in cohort(1000, ties=True)))
+        assert scale.classify(scores) == self.pure(monkeypatch, lambda: scale.classify(scores))
+
+
+class TestAccumulator:
+    def test_snapshot_matches_summarize(self):
+        records = cohort(3000, seed=2)
+        acc = ExamStatsAccumulator()
+        acc.add(records[0])
+        acc.extend(records[1:1000])
+        acc.extend(iter(records[1000:2000]))
+        acc.extend(RecordBatch.from_records(records[2000:]))
+        assert acc.snapshot() == examlib.summarize(records)
+
+    def test_merge_matches_one_accumulator(self):
+        records = cohort(900, seed=4, ties=True)
+        whole = ExamStatsAccumulator(60)
+        whole.extend(records)
+        shards = [ExamStatsAccumulator(60) for _ in range(3)]
+        for i, shard in enumerate(shards):
+            shard.extend(records[i * 300:(i + 1) * 300])
+        merged = shards[0]
+        merged.merge(shards[1])
+        merged.merge(shards[2])
+        assert merged.snapshot() == whole.snapshot()
+
+    def test_ties_keep_the_first_student(self):
+        first, second = ExamStatsAccumulator(), ExamStatsAccumulator()
+        first.add({"name": "early", "score": 90, "weight": 1})
+        second.add({"name": "late", "score": 90, "weight": 1})
+        first.merge(second)
+        assert first.snapshot()["top_student"] == "early"
+        first.extend([{"name": "later", "score": 90, "weight": 1}])
+        assert first.snapshot()["top_student"] == "early"
+
+    def test_exact_sums_do_not_depend_on_splits(self):
+        acc = ExamStatsAccumulator()
+        for r in reversed(HALFWAY):
+            acc.add(r)
+        whole = ExamStatsAccumulator()
+        whole.extend(HALFWAY)
+        assert acc.snapshot(exact=True) == whole.snapshot(exact=True)
+        assert acc.snapshot(exact=True)["weighted_average"] == 24.57
+
+    def test_ambiguous_rounding_raises(self):
+        # summarize() gives 24.56 here; the exact sums alone cannot tell.
+        acc = ExamStatsAccumulator()
+        acc.extend(HALFWAY)
+        with pytest.raises(AmbiguousRoundingError, match="pass exact=True"):
+            acc.snapshot()
+
+    def test_settled_rounding_matches_summarize(self):
+        settled = 0
+        for seed in range(300):
+            records = cohort(1 + seed % 40, seed=seed)
+            acc = ExamStatsAccumulator()
+            acc.extend(records)
+            try:
+                snapshot = acc.snapshot()
+            except AmbiguousRoundingError:
+                continue
+            settled += 1
+            assert snapshot == examlib.summarize(records)
+        assert settled > 280
+
+    def test_error_indices_span_calls(self):
+        acc = ExamStatsAccumulator()
+        acc.extend(EXAMPLE)
+        with pytest.raises(InvalidRecordError, match="record 7 missing required field: name"):
+            acc.extend([EXAMPLE[0], EXAMPLE[1], INVALID[0], EXAMPLE[2]])
+        # Records before the invalid one stay added.
+        assert acc.count == 7
+        with pytest.raises(MultipleRecordErrors, match="record 8 .*record 10 "):
+            acc.extend([INVALID[3], EXAMPLE[0], INVALID[4]], collect_errors=True)
+        assert acc.count == 8
+
+    def test_chunk_boundaries(self, monkeypatch):
+        monkeypatch.setattr(examlib, "_ACCUMULATE_CHUNK", 7)
+        records = cohort(100, seed=8)
+        acc = ExamStatsAccumulator()
+        acc.extend(iter(records))
+        reference = ExamStatsAccumulator()
+        reference.extend(RecordBatch.from_records(records))
+        assert acc.snapshot() == reference.snapshot()
+        assert acc._weighted_sum.value() == reference._weighted_sum.value()
+
+    def test_exact_sum_extend_matches_add(self):
+        rng = random.Random(6)
+        values = [rng.uniform(-1, 1) * 10 ** rng.uniform(-20, 20) for _ in range(2000)]
+        one, block = examlib._ExactSum(), examlib._ExactSum()
+        for x in values:
+            one.add(x)
+        block.extend(values[:1000])
+        block.extend(array("d", values[1000:]))
+        assert one.value() == block.value() == math.fsum(values)
+
+    def test_merge_requires_same_settings(self):
+        with pytest.raises(InvalidRecordError, match="cannot merge"):
+            ExamStatsAccumulator(50).merge(ExamStatsAccumulator(60))
+
+    def test_empty_snapshot(self):
+        with pytest.raises(InvalidRecordError, match="cannot be empty"):
+            ExamStatsAccumulator().snapshot()
+
+
+class TestSummarizeParallel:
+    def test_matches_serial(self):
+        records = cohort(2500, seed=9)
+        result = examlib.summarize_parallel(iter(records), workers=2, chunk_size=300)
+        assert result == examlib.summarize(records)
+        assert result == examlib.summarize_parallel(records, workers=1)
+        assert examlib.summarize_parallel(RecordBatch.from_records(records), workers=2, chunk_size=300) == result
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_ambiguous_rounding_matches_serial(self, workers):
+        # The exact mean rounds to 24.57; summarize() has always said 24.56.
+        assert examlib.summarize_parallel(HALFWAY, workers=workers, chunk_size=2) == examlib.summarize(HALFWAY)
+        batch = RecordBatch.from_records(HALFWAY)
+        assert examlib.summarize_parallel(batch, workers=workers, chunk_size=2) == examlib.summarize(HALFWAY)
+
+    def test_first_error_has_global_index(self):
+        records = cohort(1000)
+        records[777] = INVALID[9]
+        with pytest.raises(InvalidRecordError, match="record 777 score must be between 0 and 100"):
+            examlib.summarize_parallel(records, workers=2, chunk_size=100)
+
+    def test_collected_errors_in_order(self):
+        records = cohort(1000)
+        for i in (950, 5, 420):
+            records[i] = INVALID[3]
+        with pytest.raises(MultipleRecordErrors) as e:
+            examlib.summarize_parallel(records, workers=2, chunk_size=100, collect_errors=True)
+        assert [str(err).split()[1] for err in e.value.errors] == ["5", "420", "950"]
+
+
+class TestGradeScale:
+    SCALE = GradeScale({"Pass": 50, "Distinction": 85, "Merit": 70}, fail="Fail")
+
+    @pytest.mark.parametrize(
+        "score, grade", [(0, "Fail"), (49.99, "Fail"), (50, "Pass"), (70, "Merit"), (84.9, "Merit"), (100, "Distinction")]
+    )
+    def test_grade(self, score, grade):
+        assert self.SCALE.grade(score) == grade
+
+    def test_classify(self):
+        counts, grades = self.SCALE.classify([91, 72, 40, 72])
+        assert grades == ["Distinction", "Merit", "Fail", "Merit"]
+        assert counts == {"Distinction": 1, "Merit": 2, "Pass": 0, "Fail": 1}
+        assert list(counts) == list(self.SCALE.grades)
+
+    def test_as_boundaries(self):
+        records = cohort(300, seed=1)
+        expected = {"Distinction": 0, "Merit": 0, "Pass": 0, "Fail": 0}
+        for r in records:
+            expected[self.SCALE.grade(r["score"])] += 1
+        assert examlib.grade_distribution(records, boundaries=self.SCALE) == expected
+        assert examlib.summarize(records, boundaries=self.SCALE)["grade_distribution"] == expected
+
+    @pytest.mark.parametrize(
+        "boundaries, message",
+        [
+            ({}, "at least one grade"),
+            ({"A": "x"}, "boundary for A must be a valid number"),
+            ({"A": 70, "F": 10}, "must not include the fail grade F"),
+            ({"A": 70, "B": 70}, "boundaries for A and B must differ"),
+        ],
+    )
+    def test_invalid(self, boundaries, message):
+        with pytest.raises(InvalidRecordError, match=message):
+            GradeScale(boundaries)
+
+    def test_mapping_is_compiled_once(self):
+        examlib._cached_scale.cache_clear()
+        boundaries = {"A": 81, "B": 71, "C": 61}
+        first = examlib._grade_scale(boundaries)
+        assert examlib._grade_scale(dict(boundaries)) is first
+        info = examlib._cached_scale.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_legacy_boundary_errors(self):
+        with pytest.raises(InvalidRecordError, match="boundaries must include B"):
+            examlib.grade_distribution(EXAMPLE, boundaries={"A": 70, "C": 50})
+        with pytest.raises(InvalidRecordError, match="strictly descending"):
+            examlib.grade_distribution(EXAMPLE, boundaries={"A": 70, "B": 70, "C": 50})
+
+
+class TestRanking:
+    def ordered(self, records):
+        # Best first; equal scores keep record order.
+        return sorted(range(len(records)), key=lambda i: -records[i]["score"])
+
+    @pytest.mark.parametrize("n", [10, 600])
+    @pytest.mark.parametrize("ties", [False, True])
+    def test_top_k_is_sorted_order(self, n, ties):
+        records = cohort(n, seed=n, ties=ties)
+        expected = [(records[i]["name"], float(records[i]["score"])) for i in self.ordered(records)]
+        for k in (1, 5, n, n + 3):
+            assert examlib.top_k(records, k) == expected[:k]
+        assert examlib.top_k(records, 1)[0][0] == examlib.top_student(records)
+
+    @pytest.mark.parametrize("n", [10, 600])
+    def test_rank(self, n):
+        records = cohort(n, seed=2, ties=True)
+        order = self.ordered(records)
+        for position in (0, n // 2, n - 1):
+            i = order[position]
+            assert examlib.rank(records, records[i]["name"]) == position + 1
+
+    def test_rank_unknown_student(self):
+        with pytest.raises(InvalidRecordError, match="no record for student 'Zed'"):
+            examlib.rank(EXAMPLE, "Zed")
+
+    @pytest.mark.parametrize("k", [0, -1, 1.5, True])
+    def test_invalid_k(self, k):
+        with pytest.raises(InvalidRecordError, match="k must be a positive integer"):
+            examlib.top_k(EXAMPLE, k)
+
+    @requires_numpy
+    @pytest.mark.parametrize("n", [1, 2, 7, 300, 1001])
+    def test_quantiles_match_numpy(self, n):
+        records = cohort(n, seed=n, ties=n == 300)
+        qs = (0, 0.1, 0.25, 0.5, 0.9, 0.99, 1)
+        expected = np.quantile([r["score"] for r in records], qs)
+        assert examlib.quantiles(records, qs) == pytest.approx(expected.tolist(), abs=1e-9)
+        assert examlib.quantile(records, 0.5) == pytest.approx(float(np.median([r["score"] for r in records])))
+
+    def test_quantiles_without_numpy(self, monkeypatch):
+        records = cohort(301, seed=1)
+        scores = sorted(r["score"] for r in records)
+        monkeypatch.setattr(examlib, "np", None)
+        assert examlib.quantiles(records, (0, 0.5, 1)) == [scores[0], scores[150], scores[-1]]
+
+    @pytest.mark.parametrize("q", [-0.1, 1.5, "0.5"])
+    def test_invalid_quantile(self, q):
+        with pytest.raises(InvalidRecordError, match="quantile must be between 0 and 1"):
+            examlib.quantile(EXAMPLE, q)
+
+
+class TestQuantileSketch:
+    def test_whole_marks_are_exact(self):
+        rng = random.Random(3)
+        scores = [rng.randint(0, 100) for _ in range(999)]
+        sketch = QuantileSketch()
+        sketch.update(scores)
+        records = [{"name": f"s{i}", "score": s, "weight": 1} for i, s in enumerate(scores)]
+        for q in (0, 0.1, 0.5, 0.9, 1):
+            assert sketch.quantile(q) == pytest.approx(examlib.quantile(records, q))
+
+    def test_within_resolution(self):
+        records = cohort(500, seed=11)
+        sketch = QuantileSketch(resolution=0.5)
+        for r in records:
+            sketch.add(r["score"])
+        for q in (0.1, 0.5, 0.9):
+            exact = examlib.quantile(records, q)
+            assert exact - 0.5 <= sketch.quantile(q) <= exact
+
+    def test_merge(self):
+        scores = [r["score"] for r in cohort(400, seed=12)]
+        whole, first, second = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        whole.update(scores)
+        first.update(scores[:150])
+        second.update(scores[150:])
+        first.merge(second)
+        assert first.count == 400
+        assert [first.quantile(q) for q in (0.2, 0.7)] == [whole.quantile(q) for q in (0.2, 0.7)]
+
+    def test_invalid(self):
+        with pytest.raises(InvalidRecordError, match="cannot merge"):
+            QuantileSketch(0.01).merge(QuantileSketch(0.1))
+        with pytest.raises(InvalidRecordError, match="score must be between 0 and 100"):
+            QuantileSketch().add(101)
+        with pytest.raises(InvalidRecordError, match="cannot be empty"):
+            QuantileSketch().quantile(0.5)
+
+
+class TestLoaders:
+    def write_csv(self, path, rows, header="name,score,weight"):
+        path.write_text("\n".join([header] + rows) + "\n", encoding="utf-8")
+        return path
+
+    def write_jsonl(self, path, lines):
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path
+
+    def test_csv_matches_records(self, tmp_path):
+        records = cohort(50)
+        path = self.write_csv(tmp_path / "a.csv", [f"{r['name']},{r['score']},{r['weight']}" for r in records])
+        batch = examlib.load_records_csv(path)
+        assert examlib.summarize(batch) == examlib.summarize(records)
+        assert batch.names == [r["name"] for r in records]
+
+    def test_csv_columns_in_any_order_and_blank_lines(self, tmp_path):
+        path = self.write_csv(tmp_path / "a.csv", ["1.5,Ann,80", "", "1,Bo,40"], header="weight, name ,score")
+        batch = examlib.load_records_csv(path)
+        assert (batch.names, list(batch.scores), list(batch.weights)) == (["Ann", "Bo"], [80.0, 40.0], [1.5, 1.0])
+
+    @pytest.mark.parametrize(
+        "row, message",
+        [
+            ("Cy,abc,1", "record 2 score must be a number"),
+            ("Cy,101,1", "record 2 score must be between 0 and 100"),
+            ("Cy,50,0", "record 2 weight must be > 0"),
+            (",50,1", "record 2 name must be a non-empty string"),
+            ("Cy,50", "record 2 missing required field: weight"),
+        ],
+    )
+    def test_csv_errors(self, tmp_path, row, message):
+        path = self.write_csv(tmp_path / "a.csv", ["Ann,80,1", "Bo,40,1", row, "Di,70,1"])
+        assert error_of(lambda: examlib.load_records_csv(path)) == message
+        with pytest.raises(MultipleRecordErrors, match=message):
+            examlib.load_records_csv(path, collect_errors=True)
+
+    def test_csv_missing_header_field(self, tmp_path):
+        path = self.write_csv(tmp_path / "a.csv", ["Ann,80"], header="name,score")
+        with pytest.raises(InvalidRecordError, match="CSV header missing required field: weight"):
+            examlib.load_records_csv(path)
+
+    def test_csv_chunking(self, tmp_path):
+        records = cohort(25)
+        path = self.write_csv(tmp_path / "a.csv", [f"{r['name']},{r['score']},{r['weight']}" for r in records])
+        batches = list(examlib.iter_batches_csv(path, chunk_size=10))
+        assert [len(b) for b in batches] == [10, 10, 5]
+        acc = ExamStatsAccumulator()
+        for batch in batches:
+            acc.extend(batch)
+        assert acc.count == 25
+        assert [n for b in batches for n in b.names] == [r["name"] for r in records]
+
+    def test_chunks_skip_collected_errors(self, tmp_path):
+        rows = [f"s{i},{50 if i % 4 else 'x'},1" for i in range(12)]
+        path = self.write_csv(tmp_path / "a.csv", rows)
+        batches = []
+        with pytest.raises(MultipleRecordErrors) as e:
+            for batch in examlib.iter_batches_csv(path, chunk_size=4, collect_errors=True):
+                batches.append(batch)
+        assert [len(b) for b in batches] == [4, 4, 1]
+        assert [str(err).split()[1] for err in e.value.errors] == ["0", "4", "8"]
+
+    def test_jsonl(self, tmp_path):
+        records = cohort(30, seed=5)
+        path = self.write_jsonl(tmp_path / "a.jsonl", [json.dumps(r) for r in records] + [""])
+        assert examlib.summarize(examlib.load_records_jsonl(path)) == examlib.summarize(records)
+        assert [len(b) for b in examlib.iter_batches_jsonl(path, chunk_size=16)] == [16, 14]
+
+    @pytest.mark.parametrize(
+        "line, message",
+        [
+            ("{not json", "record 1 is not valid JSON"),
+            ("[1, 2]", "record 1 must be a JSON object"),
+            ('{"name": "Bo", "score": 40}', "record 1 missing required field: weight"),
+            ('{"name": "Bo", "score": "40", "weight": 1}', "record 1 score must be a number"),
+        ],
+    )
+    def test_jsonl_errors(self, tmp_path, line, message):
+        path = self.write_jsonl(tmp_path / "a.jsonl", [json.dumps(EXAMPLE[0]), line])
+        assert error_of(lambda: examlib.load_records_jsonl(path)) == message
+
+    def test_empty_file(self, tmp_path):
+        path = self.write_csv(tmp_path / "a.csv", [])
+        with pytest.raises(InvalidRecordError, match="cannot be empty"):
+            examlib.load_records_csv(path)
+
+    @requires_pyarrow
+    def test_parquet(self, tmp_path):
+        import pyarrow as pa
+
+        records = cohort(40, seed=6)
+        records[33] = {"name": "bad", "score": 120.0, "weight": 1.0}
+        path = tmp_path / "a.parquet"
+        examlib.pq.write_table(pa.Table.from_pylist(records), path)
+        with pytest.raises(InvalidRecordError, match="record 33 score must be between 0 and 100"):
+            examlib.load_records_parquet(path)
+        with pytest.raises(MultipleRecordErrors):
+            list(examlib.iter_batches_parquet(path, chunk_size=16, collect_errors=True))
+        del records[33]
+        examlib.pq.write_table(pa.Table.from_pylist(records), path)
+        assert examlib.summarize(examlib.load_records_parquet(path)) == examlib.summarize(records)
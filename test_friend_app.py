@@ -0,0 +1,104 @@
+import os
+import sqlite3
+
+import pytest
+
+pytest.importorskip("streamlit")
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import friend_app  # noqa: E402
+from friend_search import FriendStore, SqliteFriendStore, save_friends_sqlite  # noqa: E402
+
+EXAMPLE = [
+    {"name": f"Friend {i}", "birthday": "1990-01-01", "hometown": "Austin, TX", "hobbies": ["Chess"], "bio": "Hi."}
+    for i in range(5)
+]
+
+
+def paged_list():
+    import streamlit as st
+
+    from friend_app import load_more_button, rows_shown
+
+    total = st.session_state.get("total", 60)
+    page_size = st.session_state.get("page_size", 25)
+    shown = rows_shown("rows", total, page_size, reset_on=st.session_state.get("query"))
+    st.write(f"rows {shown}")
+    load_more_button("rows", total, shown, page_size)
+
+
+def shown_rows(at):
+    [text] = [m.value for m in at.markdown if m.value.startswith("rows ")]
+    return int(text.split()[1])
+
+
+@pytest.fixture
+def app():
+    return AppTest.from_function(paged_list).run()
+
+
+class TestPaging:
+    def test_load_more_adds_a_page(self, app):
+        assert shown_rows(app) == 25
+        assert app.caption[0].value == "Showing 25 of 60"
+        app.button(key="rows_more").click().run()
+        assert shown_rows(app) == 50
+        app.button(key="rows_more").click().run()
+        assert shown_rows(app) == 60
+        assert not app.button and not app.caption
+
+    def test_new_query_or_page_size_starts_over(self, app):
+        app.button(key="rows_more").click().run()
+        app.session_state["query"] = "an"
+        assert shown_rows(app.run()) == 25
+        app.button(key="rows_more").click().run()
+        app.session_state["page_size"] = 10
+        assert shown_rows(app.run()) == 10
+
+    def test_short_list_has_no_button(self, app):
+        app.session_state["total"] = 7
+        assert shown_rows(app.run()) == 7
+        assert not app.button
+
+
+@pytest.fixture
+def caches():
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    yield
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+
+class TestData:
+    def test_example_friends(self, caches, monkeypatch):
+        monkeypatch.delenv("FRIENDS_DATA", raising=False)
+        version = friend_app.data_version(EXAMPLE)
+        store = friend_app.get_store(version)
+        assert isinstance(store, FriendStore) and len(store) == 5
+        assert friend_app.get_store(friend_app.data_version(EXAMPLE)) is store
+        assert friend_app.get_index(version).search("", ["Name"]) == store.ids
+        # Each app's example list is cached on its own.
+        assert len(friend_app.get_store(friend_app.data_version(EXAMPLE[:2]))) == 2
+
+    def test_file_is_reloaded_when_it_changes(self, caches, monkeypatch, tmp_path):
+        path = tmp_path / "friends.db"
+        save_friends_sqlite(str(path), EXAMPLE)
+        monkeypatch.setenv("FRIENDS_DATA", str(path))
+        version = friend_app.data_version(EXAMPLE)
+        store = friend_app.get_store(version)
+        assert isinstance(store, SqliteFriendStore)
+        assert [f["name"] for _, f in friend_app.fetch_friends(version, (1, 2))] == ["Friend 0", "Friend 1"]
+        os.utime(path, (0, 0))
+        assert friend_app.get_store(friend_app.data_version(EXAMPLE)) is not store
+
+    def test_fetch_friends_skips_deleted_rows(self, caches, monkeypatch, tmp_path):
+        path = tmp_path / "friends.db"
+        save_friends_sqlite(str(path), EXAMPLE)
+        monkeypatch.setenv("FRIENDS_DATA", str(path))
+        version = friend_app.data_version(EXAMPLE)
+        friend_app.get_store(version)
+        with sqlite3.connect(path) as conn:
+            conn.execute("DELETE FROM friends WHERE id = 2")
+        assert [fid for fid, _ in friend_app.fetch_friends(version, (1, 2, 3))] == [1, 3]
@@ -0,0 +1,283 @@
+import json
+import random
+import sqlite3
+
+import pytest
+
+from friend_search import (
+    FIELDS,
+    HOBBY_SEP,
+    FriendIndex,
+    FriendRanker,
+    FriendStore,
+    IncrementalSearch,
+    SqliteFriendStore,
+    load_friends_csv,
+    open_friend_store,
+    save_friends_sqlite,
+)
+
+FIRST = ["Ava", "Liam", "Zoë", "José", "Mia", "Noah", "Ann", "Annika"]
+LAST = ["Martinez", "O'Connor", "Thompson", "Patel", "Nguyen", "Anderson"]
+TOWNS = ["Austin, TX", "Dublin, Ireland", "San Diego, CA", "Ahmedabad, India", "Dallas, TX"]
+HOBBIES = ["Hiking", "Chess", "Painting", "Rock climbing", "Baking", "Birdwatching", "hiking"]
+WORDS = ["loves", "coffee", "and", "long", "walks", "reading", "sci-fi", "hiking", "trails", "guitar"]
+
+
+def make_friends(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+            "birthday": f"19{rng.randint(70, 99)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+            "hometown": rng.choice(TOWNS),
+            "hobbies": rng.sample(HOBBIES, rng.randint(0, 3)),
+            "bio": " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12))).capitalize() + ".",
+        }
+        for _ in range(n)
+    ]
+
+
+FRIENDS = make_friends(400)
+
+
+def linear_matches(friend, q, fields):
+    # The scan both apps did before the index.
+    q = q.lower()
+    if "Name" in fields and q in friend["name"].lower():
+        return True
+    if "Hometown" in fields and q in friend["hometown"].lower():
+        return True
+    if "Hobbies" in fields:
+        for h in friend["hobbies"]:
+            if q in h.lower():
+                return True
+    if "Bio" in fields and q in friend["bio"].lower():
+        return True
+    return False
+
+
+def linear_search(friends, query, fields, hometown="All", hobby_filters=()):
+    q = query.strip().lower()
+    results = []
+    for i, f in enumerate(friends):
+        if hometown != "All" and f["hometown"] != hometown:
+            continue
+        if hobby_filters:
+            lowered = [h.lower() for h in f["hobbies"]]
+            if not any(h.lower() in lowered for h in hobby_filters):
+                continue
+        if not q or linear_matches(f, q, fields):
+            results.append(i)
+    return results
+
+
+QUERIES = ["", "a", "an", "ann", "Ann", "o'c", "tx", ", ", "hik", "hiking", "ing", "zoë", "xyz", "e.", "\n", "g\nc"]
+FIELD_CHOICES = [FIELDS, ["Name"], ["Hometown"], ["Hobbies"], ["Bio"], ["Name", "Hobbies"], []]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return FriendIndex(FriendStore(FRIENDS))
+
+
+class TestFriendIndex:
+    @pytest.mark.parametrize("fields", FIELD_CHOICES)
+    def test_search_matches_linear_scan(self, index, fields):
+        for query in QUERIES:
+            expected = list(range(len(FRIENDS))) if not query else [
+                i for i, f in enumerate(FRIENDS) if linear_matches(f, query, fields)
+            ]
+            assert index.search(query, fields) == expected, query
+
+    @pytest.mark.parametrize("hometown", ["All", "Dublin, Ireland", "Nowhere"])
+    @pytest.mark.parametrize("hobbies", [[], ["Chess"], ["HIKING", "Baking"], ["Unknown"]])
+    def test_filters_match_linear_scan(self, index, hometown, hobbies):
+        for query in ("", "an", "coffee"):
+            found = index.match(query.strip(), FIELDS)
+            town = index.filter(hometown=None if hometown == "All" else hometown)
+            expected = linear_search(FRIENDS, query, FIELDS, hometown, hobbies)
+            assert index.ids_of(index.combine(found, town, index.filter(hobbies=hobbies))) == expected
+
+    def test_counts(self, index):
+        found = index.match("an", ["Name"])
+        counts = index.hometown_counts(found)
+        for town in TOWNS:
+            assert counts[town] == len(linear_search(FRIENDS, "an", ["Name"], town))
+        assert index.hometown_counts() == {t: sum(f["hometown"] == t for f in FRIENDS) for t in index.hometowns}
+        # Spellings differing only in case are one hobby, shown as first seen.
+        [hiking] = [h for h in index.hobbies if h.lower() == "hiking"]
+        first = next(h for f in FRIENDS for h in f["hobbies"] if h.lower() == "hiking")
+        assert hiking == first
+        assert index.hobby_counts()[hiking] == len(linear_search(FRIENDS, "", FIELDS, hobby_filters=["hiking"]))
+
+    def test_ids_follow_store(self):
+        friends = [dict(f, id=f"f{i}") for i, f in enumerate(FRIENDS[:20])]
+        index = FriendIndex(FriendStore(friends))
+        assert index.search("", FIELDS) == [f["id"] for f in friends]
+        assert index.search("an", ["Name"]) == [f["id"] for f in friends if "an" in f["name"].lower()]
+
+
+class TestIncrementalSearch:
+    def test_typing_and_backspacing(self, index):
+        search = IncrementalSearch(index, size=8)
+        word = "annika martinez"
+        typed = [word[:k] for k in range(len(word) + 1)] + [word[:k] for k in range(len(word), -1, -1)]
+        for query in typed:
+            assert search.search(query, ["Name", "Bio"]) == index.search(query, ["Name", "Bio"])
+            assert search.match(query, ["Name", "Bio"]) == index.match(query, ["Name", "Bio"])
+
+    def test_longer_query_narrows_remembered_texts(self, index, monkeypatch):
+        search = IncrementalSearch(index)
+        search.match("an", FIELDS)
+        calls = []
+        match_texts = index.match_texts
+
+        def spy(query, fields, within=None):
+            calls.append((query, within is not None))
+            return match_texts(query, fields, within)
+
+        monkeypatch.setattr(index, "match_texts", spy)
+        search.match("ann", FIELDS)
+        search.match("xann", FIELDS)
+        search.match("zzz", FIELDS)
+        assert calls == [("ann", True), ("xann", True), ("zzz", False)]
+
+    def test_remembered_results_skip_the_index(self, index, monkeypatch):
+        search = IncrementalSearch(index)
+        first = search.search("an", ["Name"], "Austin, TX", ["Chess"])
+        monkeypatch.setattr(index, "match_texts", None)
+        monkeypatch.setattr(index, "filter", None)
+        assert search.search("AN", ["Name"], "Austin, TX", ["chess"]) is first
+
+    def test_least_recently_used_are_dropped(self, index):
+        search = IncrementalSearch(index, size=2)
+        for query in ("aa", "bb", "cc"):
+            search.search(query, FIELDS)
+        assert [key[0] for key in search._results] == ["bb", "cc"]
+
+
+class TestStores:
+    def test_ids_default_to_positions(self):
+        friends = [dict(FRIENDS[0], id="a"), FRIENDS[1], dict(FRIENDS[2], id=7)]
+        store = FriendStore(friends)
+        assert store.ids == ["a", 1, 7]
+        assert list(store.items()) == list(zip(store.ids, friends))
+        assert store[7] == friends[2]
+        assert "a" in store and 0 not in store
+        assert store.get(0) is None
+        assert len(store) == 3
+
+    def test_duplicate_ids(self):
+        with pytest.raises(ValueError, match="duplicate friend id: 3"):
+            FriendStore([dict(FRIENDS[0], id=3), dict(FRIENDS[1], id=3)])
+
+    def test_sqlite_round_trip(self, tmp_path):
+        path = tmp_path / "friends.db"
+        friends = [dict(f, id=10 + i) for i, f in enumerate(FRIENDS[:50])]
+        save_friends_sqlite(str(path), friends)
+        store = SqliteFriendStore(str(path))
+        assert store.ids == [f["id"] for f in friends]
+        assert store.get_many([59, 10]) == [friends[49], friends[0]]
+        assert list(store.items()) == [(f["id"], f) for f in friends]
+        assert 10 in store and 60 not in store
+        assert store.get(60) is None
+        with pytest.raises(KeyError):
+            store[60]
+        assert FriendIndex(store).search("an", FIELDS) == FriendIndex(FriendStore(friends)).search("an", FIELDS)
+
+    def test_sqlite_rows_deleted_after_loading(self, tmp_path):
+        path = tmp_path / "friends.db"
+        save_friends_sqlite(str(path), FRIENDS[:5])
+        store = SqliteFriendStore(str(path))
+        with sqlite3.connect(path) as conn:
+            conn.execute("DELETE FROM friends WHERE id IN (2, 4)")
+        assert store.ids == [1, 2, 3, 4, 5]
+        assert store.get(2) is None
+        with pytest.raises(KeyError):
+            store[4]
+        assert [f and f["name"] for f in store.get_many(store.ids)] == [
+            FRIENDS[0]["name"], None, FRIENDS[2]["name"], None, FRIENDS[4]["name"]
+        ]
+
+    def test_get_many_flags_unknown_ids(self):
+        store = FriendStore(FRIENDS[:3])
+        assert store.get_many([2, 7, 0]) == [FRIENDS[2], None, FRIENDS[0]]
+
+    def test_sqlite_numbers_friends_without_ids(self, tmp_path):
+        path = tmp_path / "friends.sqlite"
+        save_friends_sqlite(str(path), FRIENDS[:3])
+        store = open_friend_store(str(path))
+        assert isinstance(store, SqliteFriendStore)
+        assert store.ids == [1, 2, 3]
+
+    def test_sqlite_store_is_read_only(self, tmp_path):
+        path = tmp_path / "friends.db"
+        save_friends_sqlite(str(path), FRIENDS[:3])
+        store = SqliteFriendStore(str(path))
+        with pytest.raises(sqlite3.OperationalError):
+            with store._connect() as conn:
+                conn.execute("DELETE FROM friends")
+
+    def test_csv_splits_hobbies(self, tmp_path):
+        path = tmp_path / "friends.csv"
+        path.write_text(
+            "name,birthday,hometown,hobbies,bio\n"
+            f"Ava,1990-01-01,\"Austin, TX\",\" Chess {HOBBY_SEP}Rock climbing{HOBBY_SEP}{HOBBY_SEP} \",Hi.\n"
+            "Bo,1991-02-02,Dublin,,Hey.\n",
+            encoding="utf-8",
+        )
+        friends = load_friends_csv(str(path))
+        assert [f["hobbies"] for f in friends] == [["Chess", "Rock climbing"], []]
+        assert friends[0]["hometown"] == "Austin, TX"
+        assert open_friend_store(str(path)).ids == [0, 1]
+
+    def test_json(self, tmp_path):
+        path = tmp_path / "friends.json"
+        path.write_text(json.dumps(FRIENDS[:5]), encoding="utf-8")
+        store = open_friend_store(str(path))
+        assert store.get_many(store.ids) == FRIENDS[:5]
+
+    def test_unsupported_file(self):
+        with pytest.raises(ValueError, match="unsupported friends file type"):
+            open_friend_store("friends.txt")
+
+
+class TestFriendRanker:
+    FRIENDS = [
+        {"name": "Pat Doe", "hometown": "Austin", "hobbies": [], "bio": "Hiking on weekends."},
+        {"name": "Hiking Joe", "hometown": "Austin", "hobbies": [], "bio": "Cooks."},
+        {"name": "Sam Roe", "hometown": "Dublin", "hobbies": ["Hiking"], "bio": "Hiking, hiking, hiking."},
+        {"name": "Lee Poe", "hometown": "Dublin", "hobbies": [], "bio": "Reads a great many long books."},
+        {"name": "Kim Loe", "hometown": "Paris", "hobbies": ["Chess"], "bio": "Hiking on weekends."},
+    ]
+
+    @pytest.fixture
+    def ranker(self):
+        return FriendRanker(FriendStore(self.FRIENDS))
+
+    def test_ordering(self, ranker):
+        scores = ranker.scores("hiking", FIELDS)
+        ranked = [fid for fid, _ in ranker.top(scores, 10)]
+        # Repeated in three fields, then a name (weight 3), then equal bios in store order.
+        assert ranked == [2, 1, 0, 4]
+        assert 3 not in scores
+
+    def test_fields_and_top_k(self, ranker):
+        scores = ranker.scores("hiking", ["Bio"])
+        assert [fid for fid, _ in ranker.top(scores, 2)] == [2, 0]
+        assert [fid for fid, _ in ranker.top(scores, 10, within={0, 1, 4})] == [0, 4]
+
+    def test_rare_words_weigh_more(self, ranker):
+        scores = ranker.scores("dublin chess", FIELDS)
+        assert scores[4] > scores[2] == scores[3]
+
+    def test_typos(self, ranker):
+        assert ranker.scores("hikng", FIELDS) == {}
+        fuzzy = ranker.scores("hikng", FIELDS, typos=True)
+        assert [fid for fid, _ in ranker.top(fuzzy, 10)] == [2, 1, 0, 4]
+        exact = ranker.scores("hiking", FIELDS)
+        assert all(fuzzy[i] < exact[i] for i in fuzzy)
+        # A word that is spelled correctly is not expanded.
+        assert ranker._variants("hiking", FIELDS, True) == [("hiking", 1.0)]
+        assert ranker.scores("qqqq", FIELDS, typos=True) == {}